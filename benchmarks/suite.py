@@ -0,0 +1,178 @@
+"""
+Масштабируемые бенчмарки: время и пиковая память по размеру пакета, время импорта,
+сравнение с сохраненным базовым уровнем.
+
+Вывод в единицах go test -bench: итерации, ns/op, B/op (op - один элемент пакета).
+
+    python benchmarks/suite.py                  # запуск и сравнение с baseline.json
+    python benchmarks/suite.py --save           # сохранение нового базового уровня
+    python benchmarks/suite.py -k hardness -t 0.5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+from copy import deepcopy
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from substance import Substance  # noqa: E402
+from substance.hardness import Hardness  # noqa: E402
+
+BASELINE = os.path.join(HERE, "baseline.json")
+SIZES = (1, 100, 10_000)
+MIN_TIME = 0.2  # с на один замер
+REPEAT = 5
+THRESHOLDS = {"ns/op": 0.5, "B/op": 0.1}  # допустимый относительный рост: время шумит, память - нет
+
+
+def substance(i: int = 0) -> Substance:
+    return Substance(
+        f"s{i}",
+        {"N2": 0.78, "O2": 0.21, "Ar": 0.01},
+        {"m": 1.0, "TT": 300.0 + i, "PP": 101325.0},
+        {"Cp": lambda TT: 1000 + 0.1 * TT},
+    )
+
+
+def cases() -> Iterator[Tuple[str, int, Callable[[], Callable[[], object]]]]:
+    """(название, размер пакета, подготовка -> измеряемая функция)"""
+    for n in SIZES:
+        yield "SubstanceInit", n, lambda n=n: lambda: [substance(i) for i in range(n)]
+
+        def copy(n=n):
+            substances = [substance(i) for i in range(n)]
+            return lambda: [deepcopy(s) for s in substances]
+
+        yield "SubstanceDeepcopy", n, copy
+
+        def evaluate(n=n):
+            s, T = substance(), np.linspace(300, 2000, n)
+            return lambda: s.evaluate("Cp", TT=T)
+
+        yield "SubstanceEvaluate", n, evaluate
+
+        def hardness(n=n):
+            HB = np.linspace(100, 600, n)
+            return lambda: Hardness.convert_array(HB=HB)
+
+        yield "HardnessConvertArray", n, hardness
+
+
+def measure(function: Callable[[], object]) -> Tuple[int, float, int]:
+    """Итерации, лучшее время на вызов (с), пиковая память вызова (байт)"""
+    function()  # прогрев
+    iterations = 1
+    while True:
+        start = perf_counter()
+        for _ in range(iterations):
+            function()
+        elapsed = perf_counter() - start
+        if elapsed >= MIN_TIME:
+            break
+        iterations *= 2 if elapsed == 0 else max(2, min(100, int(MIN_TIME / elapsed) + 1))
+    best = elapsed
+    for _ in range(REPEAT - 1):
+        start = perf_counter()
+        for _ in range(iterations):
+            function()
+        best = min(best, perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return iterations, best / iterations, peak
+
+
+def import_time(module: str, repeat: int = 5) -> float:
+    """Лучшее время импорта модуля в новом интерпретаторе (с)"""
+    code = f"from time import perf_counter; s = perf_counter(); import {module}; print(perf_counter() - s)"
+    times = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code], check=True, capture_output=True, text=True, cwd=os.path.dirname(HERE)
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+    return min(times)
+
+
+def run(keyword: str = "") -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, n, setup in cases():
+        key = f"Benchmark{name}/n={n}"
+        if keyword.lower() not in key.lower():
+            continue
+        iterations, seconds, peak = measure(setup())
+        results[key] = {"ns/op": seconds * 1e9 / n, "B/op": peak / n}
+        print(f"{key:<40} {iterations:>10} {seconds * 1e9 / n:>14.2f} ns/op {peak / n:>12.0f} B/op", flush=True)
+    for module in ("substance", "substance.hardness"):
+        key = f"BenchmarkImport/{module}"
+        if keyword.lower() not in key.lower():
+            continue
+        seconds = import_time(module)
+        results[key] = {"ns/op": seconds * 1e9}
+        print(f"{key:<40} {1:>10} {seconds * 1e9:>14.0f} ns/op", flush=True)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], thresholds: Dict[str, float]
+) -> List[str]:
+    """Регрессии: метрики, превысившие базовый уровень более чем на порог метрики"""
+    regressions = []
+    for key, metrics in results.items():
+        for metric, value in metrics.items():
+            reference = baseline.get(key, {}).get(metric)
+            if reference and value > reference * (1 + thresholds[metric]):
+                regressions.append(f"{key} {metric}: {value:.2f} > {reference:.2f} (+{value / reference - 1:.0%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1], formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--save", action="store_true", help="save results as the new baseline")
+    parser.add_argument("-b", "--baseline", default=BASELINE, help="baseline JSON file")
+    parser.add_argument(
+        "-t", "--threshold", type=float, default=THRESHOLDS["ns/op"], help="allowed relative ns/op growth"
+    )
+    parser.add_argument(
+        "-m", "--memory-threshold", type=float, default=THRESHOLDS["B/op"], help="allowed relative B/op growth"
+    )
+    parser.add_argument("-k", "--keyword", default="", help="run only benchmarks containing keyword")
+    args = parser.parse_args(argv)
+
+    print(f"python: {sys.version.split()[0]}\nplatform: {sys.platform}")
+    results = run(args.keyword)
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "rt") as file:
+                baseline = json.load(file)
+        with open(args.baseline, "wt") as file:
+            json.dump({**baseline, **results}, file, indent=4, sort_keys=True)
+        print(f"baseline saved: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"no baseline: {args.baseline}, run with --save")
+        return 0
+    with open(args.baseline, "rt") as file:
+        regressions = compare(results, json.load(file), {"ns/op": args.threshold, "B/op": args.memory_threshold})
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    print("FAIL" if regressions else "ok")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,41 @@
-from .hardness import Hardness
-from .substance import Substance
+from importlib import import_module
+
+from .composition import CompositionIndex
+from .function import MemoizedFunction, NamedFunction, TabulatedFunction, depends, register
+from .similarity import SimilarityIndex
+from .substance import FrozenSubstance, Substance
+from .table import SubstanceTable
 
 # import *
 __all__ = [
-    Hardness,
-    Substance,
+    "CompositionIndex",
+    "FrozenSubstance",
+    "Hardness",
+    "HardnessArray",
+    "MemoizedFunction",
+    "NamedFunction",
+    "SimilarityIndex",
+    "Substance",
+    "SubstanceTable",
+    "TabulatedFunction",
+    "depends",
+    "register",
 ]
+
+# тяжелые подпакеты импортируются при первом обращении
+_lazy = {
+    "hardness": ("substance.hardness", None),
+    "Hardness": ("substance.hardness", "Hardness"),
+    "HardnessArray": ("substance.hardness", "HardnessArray"),
+}
+
+
+def __getattr__(name: str):
+    if name not in _lazy:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attribute = _lazy[name]
+    value = import_module(module)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
@@ -0,0 +1,127 @@
+from bisect import bisect_left, insort
+from math import inf
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .substance import Substance
+
+Range = Tuple[Optional[float], Optional[float]]  # [от, до), None - без границы
+
+
+class CompositionIndex:
+    """
+    Инвертированный индекс химического состава: для каждого компонента -
+    отсортированный список (массовая доля, ключ вещества).
+    Доли берутся из composition как есть: Substance уже хранит их нормализованными.
+    """
+
+    __slots__ = ("substances", "fractions", "species", "next")
+
+    def __init__(self, substances: Iterable[Substance] = ()) -> None:
+        self.substances: Dict[int, Substance] = {}  # ключ: вещество
+        self.fractions: Dict[int, Dict[str, float]] = {}  # ключ: проиндексированный состав
+        self.species: Dict[str, List[Tuple[float, int]]] = {}  # компонент: [(доля, ключ)]
+        self.next = 0
+        for substance in substances:
+            self.insert(substance)
+
+    def __len__(self) -> int:
+        return len(self.substances)
+
+    def __getitem__(self, key: int) -> Substance:
+        return self.substances[key]
+
+    def insert(self, substance: Substance) -> int:
+        """Добавление вещества, возвращает ключ"""
+        key = self.next
+        self.next += 1
+        self.substances[key] = substance
+        self.__add(key, substance.composition)
+        return key
+
+    def remove(self, key: int) -> Substance:
+        """Удаление вещества по ключу"""
+        self.__discard(key)
+        return self.substances.pop(key)
+
+    def update(self, key: int, substance: Optional[Substance] = None) -> None:
+        """Переиндексация после изменения состава вещества или замена вещества"""
+        if substance is not None:
+            self.substances[key] = substance
+        self.__discard(key)
+        self.__add(key, self.substances[key].composition)
+
+    def __add(self, key: int, composition: Dict[str, float]) -> None:
+        fractions = {k: v for k, v in composition.items() if v > 0}
+        self.fractions[key] = fractions
+        for species, fraction in fractions.items():
+            insort(self.species.setdefault(species, []), (fraction, key))
+
+    def __discard(self, key: int) -> None:
+        for species, fraction in self.fractions.pop(key).items():
+            entries = self.species[species]
+            del entries[bisect_left(entries, (fraction, key))]
+            if not entries:
+                del self.species[species]
+
+    def __bounds(self, species: str, start: Optional[float], stop: Optional[float]):
+        """Записи компонента и границы [lo, hi) долей из [start, stop)"""
+        entries = self.species.get(species, [])
+        lo = 0 if start is None else bisect_left(entries, (start, -inf))
+        hi = len(entries) if stop is None else max(lo, bisect_left(entries, (stop, -inf)))
+        return entries, lo, hi
+
+    def between(self, species: str, start: Optional[float] = None, stop: Optional[float] = None) -> List[int]:
+        """Ключи веществ, содержащих species с долей в [start, stop)"""
+        entries, lo, hi = self.__bounds(species, start, stop)
+        return [key for _, key in entries[lo:hi]]
+
+    def containing(self, *species: str) -> List[int]:
+        """Ключи веществ, содержащих все species"""
+        return self.query({s: (None, None) for s in species}, absent=False)
+
+    def query(self, ranges: Optional[Dict[str, Range]] = None, absent: bool = True, **kwargs: Range) -> List[int]:
+        """
+        Ключи веществ, доли компонентов которых попадают во все диапазоны [от, до).
+
+        Args:
+            ranges: Компонент: (от, до), None - без границы
+            absent: Отсутствующий компонент имеет долю 0 и попадает в диапазоны, содержащие 0
+            kwargs: Диапазоны для компонентов с именами-идентификаторами, например Cr=(0.12, None)
+
+        Example:
+            index.query(Cr=(0.12, None), Ni=(None, 0.02))  # Cr >= 0.12 и Ni < 0.02
+        """
+        ranges = {**(ranges or {}), **kwargs}
+
+        def zero(start, stop) -> bool:
+            return absent and (start is None or start <= 0) and (stop is None or 0 < stop)
+
+        selective = [(s, r) for s, r in ranges.items() if not zero(*r)]
+        if not selective:  # все диапазоны содержат 0: исключаются доли вне диапазонов
+            excluded: Set[int] = set()
+            for species, (start, stop) in ranges.items():
+                entries, lo, hi = self.__bounds(species, start, stop)
+                excluded.update(key for _, key in entries[:lo])
+                excluded.update(key for _, key in entries[hi:])
+            return sorted(self.substances.keys() - excluded)
+
+        # кандидаты - наименьший диапазон, остальные условия - проверка доли
+        sizes = [hi - lo for _, lo, hi in (self.__bounds(s, *r) for s, r in selective)]
+        species, (start, stop) = selective[sizes.index(min(sizes))]
+        result = []
+        for key in self.between(species, start, stop):
+            fractions = self.fractions[key]
+            for species, (start, stop) in ranges.items():
+                fraction = fractions.get(species)
+                if fraction is None:
+                    if not zero(start, stop):
+                        break
+                elif (start is not None and fraction < start) or (stop is not None and fraction >= stop):
+                    break
+            else:
+                result.append(key)
+        return sorted(result)
+
+    def select(self, keys: Sequence[int]) -> List[Substance]:
+        """Вещества по ключам"""
+        return [self.substances[key] for key in keys]
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+try:
+    from .composition import CompositionIndex
+    from .substance import Substance
+except ImportError:
+    from substance.composition import CompositionIndex
+    from substance.substance import Substance
+
+
+def alloys(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    substances = []
+    for i in range(n):
+        composition = {"Fe": rng.uniform(0.5, 1)}
+        for species, high in (("Cr", 0.3), ("Ni", 0.1), ("C", 0.02)):
+            if rng.random() < 0.5:
+                composition[species] = rng.uniform(0.001, high)
+        if i % 10 == 0:
+            composition = {"H2O": 1.0}
+        substances.append(Substance(f"s{i}", composition))
+    return substances
+
+
+def scan(substances, ranges, absent=True):
+    """Полный перебор для сравнения"""
+    result = []
+    for key, substance in enumerate(substances):
+        for species, (start, stop) in ranges.items():
+            if species not in substance.composition and not absent:
+                break
+            fraction = substance.composition.get(species, 0.0)
+            if (start is not None and fraction < start) or (stop is not None and fraction >= stop):
+                break
+        else:
+            result.append(key)
+    return result
+
+
+class TestCompositionIndex:
+    """Тесты для инвертированного индекса состава"""
+
+    @pytest.mark.parametrize(
+        "ranges",
+        [
+            {"Cr": (0.12, None), "Ni": (None, 0.02)},
+            {"Ni": (None, 0.02)},
+            {"Ni": (None, 0.02), "C": (0, 0.01)},
+            {"H2O": (1, None)},
+            {"Cr": (0.05, 0.1), "Ni": (0.01, 0.05), "C": (None, None)},
+            {"Cr": (0.2, 0.1)},
+            {"Mo": (None, 0.5)},
+            {"Mo": (0.1, None)},
+            {},
+        ],
+    )
+    def test_query(self, ranges):
+        substances = alloys(500)
+        index = CompositionIndex(substances)
+        assert index.query(ranges) == scan(substances, ranges)
+        assert index.query(ranges, absent=False) == scan(substances, ranges, absent=False)
+
+    def test_api(self):
+        substances = alloys(100)
+        index = CompositionIndex(substances)
+        assert len(index) == 100
+        assert index.query(Cr=(0.12, None), Ni=(None, 0.02)) == index.query({"Cr": (0.12, None), "Ni": (None, 0.02)})
+        assert index.containing("H2O") == list(range(0, 100, 10))
+        assert index.select(index.containing("H2O"))[1] is substances[10]
+        assert index.between("H2O", 1) == list(range(0, 100, 10))
+
+    def test_incremental(self):
+        substances = alloys(200)
+        index = CompositionIndex(substances[:100])
+        for substance in substances[100:]:
+            index.insert(substance)
+        removed = [index.remove(key) for key in range(0, 200, 3)]
+        assert removed[1] is substances[3]
+        with pytest.raises(KeyError):
+            index.remove(0)
+
+        substances[1].composition = {"Fe": 0.8, "Cr": 0.2}  # изменение состава
+        index.update(1)
+        index.update(2, Substance("steam", {"H2O": 1}))
+        substances[2] = index[2]
+
+        kept = [key for key in range(200) if key % 3]
+        expected = [kept[i] for i in scan([substances[k] for k in kept], {"Cr": (0.12, None), "Ni": (None, 0.02)})]
+        assert index.query(Cr=(0.12, None), Ni=(None, 0.02)) == expected
+        assert 1 in expected and 2 in index.containing("H2O")
+        assert index.insert(substances[0]) == 200
+
+    @pytest.mark.parametrize("indexed", [False, True])
+    @pytest.mark.benchmark
+    def test_composition_query(self, benchmark, indexed):
+        substances = alloys(50_000)
+        ranges = {"Cr": (0.28, None), "Ni": (None, 0.02)}
+        if indexed:
+            index = CompositionIndex(substances)
+            benchmark(index.query, ranges)
+        else:
+            benchmark(scan, substances, ranges)
+
+
+if __name__ == "__main__":
+    pytest.main(
+        [
+            __file__,
+            "-v",
+            "-s",
+            "-x",
+            "--benchmark-columns=mean,min,max,stddev,median,rounds,outliers",
+            "--benchmark-sort=name",
+            "--benchmark-min-rounds=10",
+        ]
+    )
@@ -0,0 +1,298 @@
+from bisect import bisect_right
+from functools import lru_cache
+from inspect import Parameter, signature
+from math import inf, nan
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+OUT_OF_DOMAIN = ("clamp", "extrapolate", "raise")
+
+
+def argument_name(function: Callable) -> str:
+    """Имя единственного аргумента функции"""
+    parameters = [
+        p
+        for p in signature(function).parameters.values()
+        if p.kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
+    ]
+    if len(parameters) != 1:
+        raise TypeError(f"{function} must have exactly 1 argument, got {[p.name for p in parameters]}")
+    return parameters[0].name
+
+
+class TabulatedFunction:
+    """Кусочно-линейная табличная аппроксимация функции одного аргумента"""
+
+    __slots__ = ("function", "argument", "out_of_domain", "x", "y", "max_error", "nodes", "rows")
+
+    def __init__(
+        self,
+        function: Callable,
+        domain: Tuple[float, float],
+        rtol: float = 1e-6,
+        atol: float = 0.0,
+        out_of_domain: str = "clamp",
+        size: int = 17,
+        max_size: int = 1_000_000,
+    ) -> None:
+        """
+        Табулирование с адаптивным делением отрезков до достижения точности.
+
+        Args:
+            function: Исходная функция одного аргумента
+            domain: Область табулирования (начало, конец)
+            rtol: Допустимая относительная погрешность в 1/4, 1/2 и 3/4 каждого отрезка
+            atol: Допустимая абсолютная погрешность (для значений около нуля)
+            out_of_domain: Поведение вне domain: "clamp" - крайнее значение,
+                "extrapolate" - продолжение крайних отрезков, "raise" - ValueError
+            size: Начальное число равномерных узлов
+            max_size: Предельное число узлов
+        """
+        start, stop = map(float, domain)
+        if not start < stop:
+            raise ValueError(f"{domain=} must be increasing")
+        if out_of_domain not in OUT_OF_DOMAIN:
+            raise ValueError(f"{out_of_domain=} not in {OUT_OF_DOMAIN}")
+        if rtol < 0 or atol < 0 or rtol == atol == 0:
+            raise ValueError(f"{rtol=} and {atol=} must be >= 0 and not both 0")
+
+        self.function = function
+        self.argument = argument_name(function)
+        self.out_of_domain = out_of_domain
+
+        def f(x: float) -> float:
+            return float(function(x))
+
+        def check(x0: float, y0: float, x1: float, y1: float) -> float:
+            """Относительная погрешность отрезка в 1/4, 1/2 и 3/4, inf - допуск превышен"""
+            error = 0.0
+            for t in (0.25, 0.5, 0.75):
+                ft = f(x0 + t * (x1 - x0))
+                deviation = abs(y0 + t * (y1 - y0) - ft)
+                if deviation > atol + rtol * abs(ft):
+                    return inf
+                if ft != 0:
+                    error = max(error, deviation / abs(ft))
+            return error
+
+        x = np.linspace(start, stop, max(size, 2)).tolist()
+        y = [f(v) for v in x]
+        errors = [None] * (len(x) - 1)  # погрешность отрезков, None - не проверен
+        while None in errors:
+            if len(x) > max_size:
+                raise ValueError(f"{rtol=}, {atol=} not reached with {max_size=} nodes")
+            refined_x, refined_y, refined_errors = [x[0]], [y[0]], []
+            for i, error in enumerate(errors):
+                x0, x1 = x[i], x[i + 1]
+                if error is None:
+                    error = check(x0, y[i], x1, y[i + 1])
+                    xm = 0.5 * (x0 + x1)
+                    if error == inf and x0 < xm < x1:  # деление пополам
+                        refined_x.append(xm)
+                        refined_y.append(f(xm))
+                        refined_errors.append(None)
+                        error = None
+                refined_x.append(x1)
+                refined_y.append(y[i + 1])
+                refined_errors.append(error)
+            x, y, errors = refined_x, refined_y, refined_errors
+
+        self.x = np.array(x)
+        self.y = np.array(y)
+        self.max_error = max(errors)  # оценка по контрольным точкам отрезков
+        slope = (np.diff(self.y) / np.diff(self.x)).tolist()
+        self.nodes = x
+        self.rows = list(zip(x, y, slope + slope[-1:]))
+
+    @property
+    def domain(self) -> Tuple[float, float]:
+        return self.nodes[0], self.nodes[-1]
+
+    @property
+    def size(self) -> int:
+        """Число узлов таблицы"""
+        return len(self.nodes)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.function}, domain={self.domain}, size={self.size}, max_error={self.max_error:.3g})"
+
+    def __call__(self, *args, **kwargs) -> Union[float, np.ndarray]:
+        if len(args) + len(kwargs) != 1 or (kwargs and self.argument not in kwargs):
+            raise TypeError(f"{self.argument!r} argument expected, got {args=}, {kwargs=}")
+        value = args[0] if args else kwargs[self.argument]
+        if isinstance(value, (int, float)):
+            return self.scalar(value)
+        return self.array(value)
+
+    def scalar(self, value: float) -> float:
+        """Вычисление в точке: бисекция и линейная интерполяция"""
+        nodes = self.nodes
+        if nodes[0] <= value <= nodes[-1]:
+            x, y, slope = self.rows[bisect_right(nodes, value) - 1]
+            return y if value == x else slope * (value - x) + y
+        if value != value:
+            return nan
+        match self.out_of_domain:
+            case "clamp":
+                return self.rows[0][1] if value < nodes[0] else self.rows[-1][1]
+            case "extrapolate":
+                x, y, slope = self.rows[0] if value < nodes[0] else self.rows[-1]
+                return slope * (value - x) + y
+            case _:
+                raise ValueError(f"{self.argument}={value} out of domain {self.domain}")
+
+    def array(self, values: np.ndarray) -> np.ndarray:
+        """Векторизованное вычисление"""
+        values = np.asarray(values, dtype="float64")
+        start, stop = self.domain
+        result = np.interp(values, self.x, self.y)  # вне области - крайние значения
+        match self.out_of_domain:
+            case "extrapolate":
+                for mask, (x, y, slope) in ((values < start, self.rows[0]), (values > stop, self.rows[-1])):
+                    result[mask] = slope * (values[mask] - x) + y
+            case "raise":
+                if np.any((values < start) | (values > stop)):
+                    raise ValueError(f"{self.argument} out of domain {self.domain}")
+        return result
+
+
+def hashable(value):
+    """Ключ кэша: скаляры NumPy -> числа Python, все NaN -> один объект nan"""
+    if isinstance(value, (np.generic, np.ndarray)) and np.ndim(value) == 0:
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return nan  # dict сравнивает ключи сначала по id
+    return value
+
+
+class MemoizedFunction:
+    """Функция с LRU-кэшем результатов по значениям аргументов"""
+
+    __slots__ = ("function", "cached")
+
+    def __init__(self, function: Callable, maxsize: Optional[int] = 128) -> None:
+        """
+        Args:
+            function: Исходная функция без побочных эффектов
+            maxsize: Размер LRU-кэша, None - без ограничения
+        """
+        self.function = function
+        self.cached = lru_cache(maxsize=maxsize)(self.call)
+
+    def call(self, key: tuple):
+        """Вызов по ключу кэша: кортеж ключ - без быстрого пути lru_cache, где 2 != 2.0"""
+        args, kwargs = key
+        return self.function(*args, **dict(kwargs))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.function}, {self.cache_info()})"
+
+    def __call__(self, *args, **kwargs):
+        arguments = (*args, *kwargs.values())
+        if any(isinstance(v, np.ndarray) and v.ndim for v in arguments):  # массивы не кэшируются
+            return self.function(*args, **kwargs)
+        return self.cached((tuple(map(hashable, args)), tuple((k, hashable(v)) for k, v in kwargs.items())))
+
+    def __reduce__(self):
+        """Сериализуется без содержимого кэша"""
+        return type(self), (self.function, self.cached.cache_info().maxsize)
+
+    def cache_info(self):
+        """Статистика кэша: hits, misses, maxsize, currsize"""
+        return self.cached.cache_info()
+
+    def cache_clear(self) -> None:
+        self.cached.cache_clear()
+
+
+class NamedFunction:
+    """Функция из реестра: сериализуется ссылкой на имя, а не кодом"""
+
+    __slots__ = ("name", "function")
+
+    def __init__(self, name: str, function: Callable) -> None:
+        self.name = name
+        self.function = function
+
+    @property
+    def __signature__(self):
+        return signature(self.function)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+    def __call__(self, *args, **kwargs):
+        return self.function(*args, **kwargs)
+
+    def __reduce__(self):
+        return lookup, (self.name,)
+
+
+REGISTRY: Dict[str, NamedFunction] = {}
+
+
+def register(name: str, function: Optional[Callable] = None, replace: bool = False):
+    """
+    Регистрация функции под именем.
+
+    Args:
+        name: Уникальное имя функции, например "air.Cp"
+        function: Функция, None - использовать как декоратор
+        replace: Заменить ранее зарегистрированную функцию
+
+    Returns:
+        NamedFunction, которая передается в Substance.functions
+    """
+    if not isinstance(name, str):
+        raise TypeError(f"{name} must be a str")
+    if function is None:
+        return lambda function: register(name, function, replace)
+    if not callable(function):
+        raise TypeError(f"Function {name} must be callable")
+    registered = REGISTRY.get(name)
+    if registered is not None and not replace:
+        if registered.function is function:
+            return registered
+        raise ValueError(f"Function {name!r} already registered")
+    REGISTRY[name] = NamedFunction(name, function)
+    return REGISTRY[name]
+
+
+def lookup(name: str) -> NamedFunction:
+    """Функция из реестра по имени"""
+    try:
+        return REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"Function {name!r} not registered") from None
+
+
+def depends(*names: str, **aliases: str):
+    """
+    Объявление параметров вещества, от которых зависит функция (аналог Function.Args).
+
+    Args:
+        names: Параметры, совпадающие с именами аргументов
+        aliases: Аргумент функции: параметр вещества, например total_temperature="TT"
+    """
+
+    def decorator(function: Callable) -> Callable:
+        function.dependencies = {**{name: name for name in names}, **aliases}
+        return function
+
+    return decorator
+
+
+def dependencies(function: Callable) -> Dict[str, str]:
+    """Аргумент функции: параметр вещества; объявленные depends или имена аргументов"""
+    declared = getattr(function, "dependencies", None)
+    if isinstance(declared, dict):
+        return dict(declared)
+    if isinstance(function, (TabulatedFunction, MemoizedFunction, NamedFunction)):  # аргументы исходной функции
+        return dependencies(function.function)
+    names = [
+        p.name
+        for p in signature(function).parameters.values()
+        if p.kind in (Parameter.POSITIONAL_OR_KEYWORD, Parameter.KEYWORD_ONLY)
+    ]
+    return {name: name for name in names}
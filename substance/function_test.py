@@ -0,0 +1,241 @@
+import pickle
+from copy import deepcopy
+from math import exp, sin
+
+import numpy as np
+import pytest
+
+try:
+    from .function import (
+        REGISTRY,
+        MemoizedFunction,
+        NamedFunction,
+        TabulatedFunction,
+        dependencies,
+        depends,
+        lookup,
+        register,
+    )
+    from .substance import Substance
+except ImportError:
+    from substance.function import (
+        REGISTRY,
+        MemoizedFunction,
+        NamedFunction,
+        TabulatedFunction,
+        dependencies,
+        depends,
+        lookup,
+        register,
+    )
+    from substance.substance import Substance
+
+
+def heat_capacity(total_temperature):
+    """Гладкая "дорогая" функция"""
+    return 1000 + 0.2 * total_temperature + sum(exp(-i) * sin(total_temperature / (100 + i)) for i in range(20))
+
+
+@pytest.fixture
+def air():
+    return Substance("air", parameters={"TT": 300.0}, functions={"hcp": heat_capacity})
+
+
+class TestTabulatedFunction:
+    """Тесты для класса TabulatedFunction"""
+
+    @pytest.mark.parametrize("rtol", [1e-3, 1e-6])
+    def test_tolerance(self, rtol):
+        """Тест достижения точности"""
+        tabulated = TabulatedFunction(heat_capacity, (200, 2000), rtol=rtol)
+        assert tabulated.domain == (200, 2000)
+        assert tabulated.max_error <= rtol
+
+        x = np.linspace(200, 2000, 10_001)
+        expected = np.array([heat_capacity(v) for v in x])
+        assert tabulated(x) == pytest.approx(expected, rel=2 * rtol)
+        assert [tabulated(v) for v in x[::100].tolist()] == pytest.approx(expected[::100], rel=2 * rtol)
+        assert tabulated(total_temperature=1234.5) == tabulated(1234.5)
+        assert tabulated.size < TabulatedFunction(heat_capacity, (200, 2000), rtol=rtol / 10).size
+
+    def test_out_of_domain(self):
+        """Тест поведения вне области"""
+        function = lambda T: T**2  # noqa: E731
+
+        clamp = TabulatedFunction(function, (1, 2), rtol=1e-4)
+        assert clamp(0.0) == clamp(1.0) == 1 and clamp(3.0) == 4
+        assert np.array_equal(clamp(np.array([0.0, 3.0])), [1, 4])
+
+        extrapolate = TabulatedFunction(function, (1, 2), rtol=1e-4, out_of_domain="extrapolate")
+        assert extrapolate(3.0) == pytest.approx(4 + 4 * 1, rel=1e-2)
+        assert extrapolate(np.array([3.0]))[0] == extrapolate(3.0)
+
+        strict = TabulatedFunction(function, (1, 2), rtol=1e-4, out_of_domain="raise")
+        with pytest.raises(ValueError):
+            strict(3.0)
+        with pytest.raises(ValueError):
+            strict(np.array([1.5, 0.5]))
+
+        assert np.isnan(clamp(float("nan")))
+
+    def test_validation(self):
+        """Тест валидации"""
+        with pytest.raises(ValueError):
+            TabulatedFunction(heat_capacity, (2, 1))
+        with pytest.raises(ValueError):
+            TabulatedFunction(heat_capacity, (1, 2), out_of_domain="wrap")
+        with pytest.raises(TypeError):
+            TabulatedFunction(lambda T, P: T * P, (1, 2))
+        with pytest.raises(ValueError):
+            TabulatedFunction(lambda T: 1 / T, (1e-9, 1), rtol=1e-12, max_size=100)
+        tabulated = TabulatedFunction(heat_capacity, (1, 2))
+        with pytest.raises(TypeError):
+            tabulated(T=1.5)
+
+    def test_compile(self, air):
+        """Тест компиляции функции вещества"""
+        tabulated = air.compile("hcp", (200, 2000), rtol=1e-6, out_of_domain="raise")
+        assert air.functions["hcp"] is tabulated
+        assert air.functions["hcp"](air.parameters["TT"]) == pytest.approx(heat_capacity(300), rel=1e-6)
+        assert air.evaluate("hcp", total_temperature=np.linspace(300, 400, 5)).shape == (5,)
+
+        recompiled = air.compile("hcp", (200, 3000))
+        assert recompiled.function is heat_capacity
+
+    @pytest.mark.parametrize("compiled", [False, True])
+    @pytest.mark.benchmark
+    def test_function_compile_call(self, benchmark, air, compiled):
+        if compiled:
+            air.compile("hcp", (200, 2000))
+        benchmark(air.functions["hcp"], 1234.5)
+
+
+class TestMemoizedFunction:
+    """Тесты мемоизации функций"""
+
+    def test_keys(self):
+        """Тест ключей: float, int, скаляры NumPy, NaN, массивы"""
+        calls = []
+        memoized = MemoizedFunction(lambda T: calls.append(T) or 2 * T, maxsize=4)
+
+        assert memoized(1.5) == memoized(np.float64(1.5)) == memoized(np.array(1.5)) == memoized(T=1.5) - 0 == 3
+        assert memoized(2) == memoized(2.0) == memoized(np.int64(2)) == 4
+        assert np.isnan(memoized(float("nan"))) and np.isnan(memoized(np.float32("nan")))
+        assert all(type(v) is float or type(v) is int for v in calls)  # в функцию - числа Python
+        assert memoized.cache_info().misses == 4  # 1.5, T=1.5, 2, nan
+
+        assert np.array_equal(memoized(np.array([1.0, 2.0])), [2, 4])  # массивы - без кэша
+        assert memoized.cache_info().currsize == 4
+
+        memoized.cache_clear()
+        assert memoized.cache_info() == (0, 0, 4, 0)
+
+    def test_substance(self, air):
+        """Тест мемоизации функций вещества"""
+        air.functions = {**air.functions, "gc": lambda T: 287.3}
+        air.memoize("hcp", maxsize=2)
+        assert isinstance(air.functions["hcp"], MemoizedFunction)
+        assert list(air.cache_info()) == ["hcp"]
+
+        for T in (300.0, 300.0, 400.0, 300.0, 500.0, 400.0):
+            assert air.functions["hcp"](T) == heat_capacity(T)
+        assert air.cache_info()["hcp"] == (2, 4, 2, 2)
+
+        copy = deepcopy(air)  # копия использует тот же кэш и не сбрасывает его
+        copy.functions["hcp"](400.0)
+        assert air.cache_info()["hcp"].hits == 3
+
+        air.functions = dict(air.functions)  # переприсвоение тех же функций кэш не сбрасывает
+        assert air.cache_info()["hcp"] == (3, 4, 2, 2)
+        other = Substance("other", {"N2": 1}, functions=air.functions)  # общие функции
+        other.compile("gc", (300, 400), rtol=1e-3)
+        assert air.cache_info()["hcp"] == (3, 4, 2, 2)
+
+        air.memoize(maxsize=None)
+        assert set(air.cache_info()) == {"hcp", "gc"}
+        assert air.functions["hcp"].function is heat_capacity
+        air.functions["gc"](1.0)
+        air.cache_clear()
+        assert all(info.currsize == 0 for info in air.cache_info().values())
+
+        air.memoize(maxsize=0)
+        assert air.functions["hcp"] is heat_capacity and air.cache_info() == {}
+
+    @pytest.mark.parametrize("memoized", [False, True])
+    @pytest.mark.benchmark
+    def test_function_memoize_call(self, benchmark, air, memoized):
+        if memoized:
+            air.memoize("hcp")
+        benchmark(air.functions["hcp"], 1234.5)
+
+
+class TestRegistry:
+    """Тесты для реестра функций"""
+
+    def test_register(self):
+        function = register("test.square", lambda x: x**2)
+        assert isinstance(function, NamedFunction) and function(x=3) == 9
+        assert lookup("test.square") is function
+        assert register("test.square", function.function) is function  # повторная регистрация
+
+        with pytest.raises(ValueError):
+            register("test.square", lambda x: x**3)
+        assert register("test.square", lambda x: x**3, replace=True)(2) == 8
+
+        @register("test.cube")
+        def cube(x):
+            return x**3
+
+        assert isinstance(cube, NamedFunction) and cube(2) == 8
+        with pytest.raises(KeyError):
+            lookup("test.missing")
+        with pytest.raises(TypeError):
+            register("test.bad", 1)
+        del REGISTRY["test.square"], REGISTRY["test.cube"]
+
+    def test_pickle(self, air):
+        function = register("test.hcp", heat_capacity)
+        assert pickle.loads(pickle.dumps(function)) is function
+
+        s = Substance("air", {"N2": 1}, functions={"hcp": function})
+        s.compile("hcp", (300, 2000), rtol=1e-3)
+        s.memoize("hcp")
+        restored = pickle.loads(pickle.dumps(s))
+        assert restored.functions["hcp"](500) == s.functions["hcp"](500)
+        assert restored.functions["hcp"].cache_info().maxsize == 128
+        del REGISTRY["test.hcp"]
+
+
+class TestDependencies:
+    """Тесты для зависимостей функций от параметров"""
+
+    def test_dependencies(self):
+        assert dependencies(lambda TT, PP: 0) == {"TT": "TT", "PP": "PP"}
+        assert dependencies(depends("TT", total_pressure="PP")(lambda **kwargs: 0)) == {
+            "TT": "TT",
+            "total_pressure": "PP",
+        }
+        assert dependencies(TabulatedFunction(heat_capacity, (300, 400), rtol=1e-3)) == {
+            "total_temperature": "total_temperature"
+        }
+        assert dependencies(MemoizedFunction(lambda TT: 0)) == {"TT": "TT"}
+        named = register("test.depends", depends(temperature="TT")(lambda temperature: 0))
+        assert dependencies(named) == {"temperature": "TT"}
+        assert dependencies(TabulatedFunction(named, (300, 400), rtol=1e-3)) == {"temperature": "TT"}
+        del REGISTRY["test.depends"]
+
+    def test_compiled_refresh(self):
+        """Скомпилированная функция с depends остается производным свойством"""
+        hcp = depends(total_temperature="TT")(lambda total_temperature: 1000 + total_temperature)
+        s = Substance("air", {"N2": 1}, {"TT": 300.0}, {"hcp": hcp})
+        assert s.refresh() == {"hcp": 1300.0}
+
+        s.compile("hcp", (200, 2000), rtol=1e-6)
+        assert s.dependents("TT") == ["hcp"]
+        assert s.refresh() == {"hcp": pytest.approx(1300.0)}
+        s.parameters["TT"] = 500.0
+        assert s.refresh() == {"hcp": pytest.approx(1500.0)}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s", "-x"])
@@ -1,6 +1,8 @@
 from .hardness import Hardness
+from .hardness_array import HardnessArray
 
 # import *
 __all__ = [
-    Hardness,
+    "Hardness",
+    "HardnessArray",
 ]
@@ -0,0 +1,118 @@
+"""
+Потоковая конвертация CSV с твердостями во все шкалы.
+
+    python -m substance.hardness convert input.csv -o output.csv --scale HB --column hb
+
+Файл читается порциями по --chunk-size строк, каждая порция конвертируется
+векторизованно и сразу записывается, поэтому память не зависит от размера файла.
+"""
+
+import argparse
+import csv
+import sys
+import time
+from contextlib import ExitStack
+from itertools import islice
+from typing import Iterable, Optional, Sequence, TextIO
+
+import numpy as np
+
+from .hardness import D10MM, SCALES, Hardness
+
+
+def parse(column: Sequence[str]) -> np.ndarray:
+    """Столбец строк -> float64, нечисловые значения -> NaN"""
+    try:
+        return np.array(column, dtype="float64")
+    except ValueError:
+        values = np.empty(len(column), dtype="float64")
+        for i, value in enumerate(column):
+            try:
+                values[i] = float(value)
+            except ValueError:
+                values[i] = np.nan
+        return values
+
+
+def convert(
+    source: TextIO,
+    target: TextIO,
+    scale: str,
+    column: Optional[str] = None,
+    axis: Optional[str] = None,
+    chunk_size: int = 65_536,
+    delimiter: str = ",",
+    prefix: str = "",
+    precision: Optional[int] = None,
+) -> int:
+    """Конвертация CSV source -> target, возвращает число строк"""
+    if scale not in SCALES:
+        raise KeyError(f"{scale=} not in {SCALES}")
+    if chunk_size < 1:
+        raise ValueError(f"{chunk_size=} must be >= 1")
+
+    reader = csv.reader(source, delimiter=delimiter)
+    writer = csv.writer(target, delimiter=delimiter, lineterminator="\n")
+    header = next(reader, None)
+    if header is None:
+        return 0
+    column = scale if column is None else column
+    if column not in header:
+        raise KeyError(f"{column=} not in {header}")
+    index = header.index(column)
+    writer.writerow(header + [prefix + s for s in SCALES])
+
+    rows_count = 0
+    while chunk := list(islice(reader, chunk_size)):
+        values = parse([row[index] if index < len(row) else "" for row in chunk])
+        converted = Hardness.convert_array(axis, **{scale: values})
+        if precision is not None:
+            converted = np.round(converted, precision)
+        converted = converted.T.tolist()
+        writer.writerows(row + values for row, values in zip(chunk, converted))
+        rows_count += len(chunk)
+    return rows_count
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m substance.hardness", description="Hardness conversion")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("convert", help="convert CSV column to all hardness scales")
+    command.add_argument("input", help="input CSV, '-' - stdin")
+    command.add_argument("-o", "--output", default="-", help="output CSV, '-' - stdout")
+    command.add_argument("-s", "--scale", required=True, choices=SCALES, help="scale of the input column")
+    command.add_argument("-c", "--column", help="input column name (default: scale)")
+    command.add_argument("--axis", choices=(D10MM,), help="convert through the shared axis")
+    command.add_argument("--chunk-size", type=int, default=65_536, help="rows per chunk")
+    command.add_argument("--delimiter", default=",")
+    command.add_argument("--prefix", default="", help="prefix of the output scale columns")
+    command.add_argument("--precision", type=int, help="decimals of the output scale columns")
+    command.add_argument("-q", "--quiet", action="store_true", help="do not report rows per second")
+    args = parser.parse_args(argv)
+
+    with ExitStack() as stack:
+        source = sys.stdin if args.input == "-" else stack.enter_context(open(args.input, "r", newline=""))
+        target = sys.stdout if args.output == "-" else stack.enter_context(open(args.output, "w", newline=""))
+        start = time.perf_counter()
+        rows_count = convert(
+            source,
+            target,
+            args.scale,
+            column=args.column,
+            axis=args.axis,
+            chunk_size=args.chunk_size,
+            delimiter=args.delimiter,
+            prefix=args.prefix,
+            precision=args.precision,
+        )
+        elapsed = time.perf_counter() - start
+
+    if not args.quiet:
+        rate = rows_count / elapsed if elapsed > 0 else float("inf")
+        print(f"{rows_count} rows in {elapsed:.3f} s: {rate:.0f} rows/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import csv
+import io
+
+import numpy as np
+import pytest
+
+try:
+    from .cli import convert, main
+    from .hardness import D10MM, Hardness
+except ImportError:
+    from substance.hardness.cli import convert, main
+    from substance.hardness.hardness import D10MM, Hardness
+
+
+@pytest.fixture
+def source():
+    """CSV с твердостями, в т.ч. вне диапазона и нечисловыми"""
+    rows = ["id,hb,note"] + [f"{i},{v},ok" for i, v in enumerate([229, 300.5, 1000, "", "hard", 150])]
+    return "\n".join(rows) + "\n"
+
+
+class TestCLI:
+    """Тесты потоковой конвертации CSV"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 4, 1024])
+    def test_convert(self, source, chunk_size):
+        """Тест конвертации порциями"""
+        target = io.StringIO()
+        assert convert(io.StringIO(source), target, "HB", column="hb", chunk_size=chunk_size) == 6
+
+        rows = list(csv.reader(io.StringIO(target.getvalue())))
+        assert rows[0] == ["id", "hb", "note", *Hardness.__slots__]
+        assert [row[:3] for row in rows[1:]] == [row[:3] for row in csv.reader(io.StringIO(source))][1:]
+
+        converted = np.array([row[3:] for row in rows[1:]], dtype="float64")
+        expected = Hardness.convert_array(HB=[229, 300.5, 1000, np.nan, np.nan, 150]).T
+        assert np.array_equal(converted, expected, equal_nan=True)
+
+    def test_convert_options(self, source):
+        """Тест параметров: ось, точность, префикс, разделитель"""
+        target = io.StringIO()
+        convert(
+            io.StringIO(source.replace(",", ";")), target, "HB", "hb", D10MM, delimiter=";", prefix="out_", precision=1
+        )
+        rows = list(csv.reader(io.StringIO(target.getvalue()), delimiter=";"))
+        assert rows[0][3:] == [f"out_{s}" for s in Hardness.__slots__]
+        assert float(rows[1][5]) == round(Hardness.convert(D10MM, HB=229)["HRC"], 1)
+
+        assert convert(io.StringIO(""), io.StringIO(), "HB") == 0
+        with pytest.raises(KeyError):
+            convert(io.StringIO(source), io.StringIO(), "HB")  # нет столбца HB
+        with pytest.raises(KeyError):
+            convert(io.StringIO(source), io.StringIO(), "HX", "hb")
+
+    def test_main(self, source, tmp_path, capsys):
+        """Тест командной строки"""
+        (tmp_path / "input.csv").write_text(source)
+        argv = ["convert", str(tmp_path / "input.csv"), "-o", str(tmp_path / "output.csv"), "-s", "HB", "-c", "hb"]
+        assert main(argv) == 0
+        assert "6 rows" in capsys.readouterr().err
+        assert len((tmp_path / "output.csv").read_text().splitlines()) == 7
+
+        with pytest.raises(SystemExit):
+            main(["convert", str(tmp_path / "input.csv"), "-s", "HX"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s", "-x"])
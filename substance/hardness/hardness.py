@@ -1,10 +1,11 @@
 import json
 import os
+from bisect import bisect_right
+from functools import cache, lru_cache
 from math import nan
-from typing import Dict
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
-from scipy.interpolate import interp1d
 
 """
 Марочник сталей и сплавов.
@@ -12,11 +13,28 @@ from scipy.interpolate import interp1d
 М.: Машиностроение, 2003. 784 с.
 """
 HERE = os.path.dirname(__file__)
-with open(os.path.join(HERE, "hardness.json"), "r") as file:
-    data = json.load(file)
+
+SCALES = ("HB", "HRA", "HRC", "HRB", "HV", "HSD")
+D10MM = "d10mm"  # диаметр отпечатка шарика 10 мм по Бринеллю - общая ось всех шкал
+
+
+@cache
+def load() -> List[Dict[str, float]]:
+    """Чтение таблицы твердостей при первом обращении"""
+    with open(os.path.join(HERE, "hardness.json"), "r") as file:
+        return json.load(file)
+
+
+def __getattr__(name: str):
+    if name == "data":
+        return load()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def interpolate(x_hardness: str, y_hardness: str, strategy="mean", kind: int = 1):
+    from scipy.interpolate import interp1d
+
+    data = load()
     # Извлекаем данные в numpy массивы
     x_data = np.array([d[x_hardness] for d in data], dtype="float64")
     y_data = np.array([d[y_hardness] for d in data], dtype="float64")
@@ -37,46 +55,178 @@ def interpolate(x_hardness: str, y_hardness: str, strategy="mean", kind: int = 1
     return interp1d(x_unique, y_unique, kind=kind, bounds_error=False, fill_value=nan)
 
 
+class Table:
+    """Кусочно-линейная таблица перевода одной шкалы в несколько шкал"""
+
+    __slots__ = ("scale", "columns", "x", "y", "slope", "lo", "hi", "nodes", "rows")
+
+    def __init__(self, scale: str, x: np.ndarray, y: np.ndarray, columns: Tuple[str, ...] = SCALES) -> None:
+        """
+        Args:
+            scale: Исходная шкала
+            x: Возрастающие уникальные значения исходной шкалы, (n,)
+            y: Значения шкал columns в узлах x, (len(columns), n)
+            columns: Целевые шкалы
+        """
+        self.scale = scale
+        self.columns = columns
+        self.x = x
+        self.y = y
+        # наклоны отрезков, последний узел - без наклона
+        self.slope = np.zeros_like(y)
+        self.slope[:, :-1] = np.diff(y, axis=1) / np.diff(x)
+        # область определения каждой шкалы
+        valid = ~np.isnan(y)
+        first = valid.argmax(axis=1)
+        last = len(x) - 1 - valid[:, ::-1].argmax(axis=1)
+        self.lo, self.hi = x[first], x[last]
+        # то же для скалярного пути на питоновских числах: (узел, значения, наклоны)
+        self.nodes = x.tolist()
+        self.rows = list(zip(self.nodes, map(tuple, y.T.tolist()), map(tuple, self.slope.T.tolist())))
+
+    def convert(self, value: float) -> Tuple[float, ...]:
+        """Скалярная интерполяция: бисекция по узлам и линейная интерполяция во все шкалы"""
+        if not self.nodes[0] <= value <= self.nodes[-1]:
+            return (nan,) * len(self.columns)
+        x, y, slope = self.rows[bisect_right(self.nodes, value) - 1]
+        if value == x:
+            return y
+        # внутри отрезка NaN на любом из концов дает NaN, т.е. вне области шкалы
+        dx = value - x
+        if len(self.columns) != len(SCALES):
+            return tuple([s * dx + b for s, b in zip(slope, y)])
+        (y0, y1, y2, y3, y4, y5), (s0, s1, s2, s3, s4, s5) = y, slope
+        return (s0 * dx + y0, s1 * dx + y1, s2 * dx + y2, s3 * dx + y3, s4 * dx + y4, s5 * dx + y5)
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        """Векторизованная интерполяция: values.shape -> (len(columns),) + values.shape"""
+        x = np.asarray(values, dtype="float64")
+        i = np.clip(np.searchsorted(self.x, x, side="right") - 1, 0, len(self.x) - 1)
+
+        shape = (-1,) + (1,) * x.ndim
+        rows = np.arange(len(self.columns)).reshape(shape)
+        x_lo, y_lo = self.x[i], self.y[rows, i]
+        # та же формула, что и в np.interp (interp1d kind=1)
+        result = np.where(x == x_lo, y_lo, self.slope[rows, i] * (x - x_lo) + y_lo)
+        result[(x < self.lo.reshape(shape)) | (x > self.hi.reshape(shape))] = nan
+        return result
+
+
+@cache
+def tabulate(x_hardness: str, strategy: str = "mean", columns: Tuple[str, ...] = SCALES) -> Table:
+    """Построение таблицы перевода x_hardness в шкалы columns"""
+    data = load()
+    x_data = np.array([d[x_hardness] for d in data], dtype="float64")
+    finite = ~np.isnan(x_data)
+    x_unique, indices = np.unique(x_data[finite], return_inverse=True)
+
+    y = np.empty((len(columns), len(x_unique)), dtype="float64")
+    for j, y_hardness in enumerate(columns):
+        y_data = np.array([d[y_hardness] for d in data], dtype="float64")[finite]
+        if strategy == "mean":
+            y[j] = [np.mean(y_data[indices == i]) for i in range(len(x_unique))]
+        elif strategy == "median":
+            y[j] = [np.median(y_data[indices == i]) for i in range(len(x_unique))]
+
+        # Заполняем внутренние пропуски, как это делает попарная интерполяция
+        valid = ~np.isnan(y[j])
+        inner = np.arange(len(x_unique))
+        inner = ~valid & (inner > inner[valid].min()) & (inner < inner[valid].max())
+        if np.any(inner):
+            y[j, inner] = np.interp(x_unique[inner], x_unique[valid], y[j, valid])
+
+    return Table(x_hardness, x_unique, y, columns)
+
+
+def through(x_hardness: str, axis: str = D10MM) -> Tuple[Table, Table]:
+    """Таблицы перевода x_hardness -> axis и axis -> все шкалы"""
+    if axis != D10MM:
+        raise ValueError(f"{axis=} must be {D10MM!r}")
+    return tabulate(x_hardness, columns=(axis,)), tabulate(axis)
+
+
+def lookup(x_hardness: str, value: float, axis: Optional[str] = None) -> Tuple[float, ...]:
+    """Значения всех шкал SCALES для значения value шкалы x_hardness"""
+    if axis is None:
+        return tabulate(x_hardness).convert(value)
+    to_axis, from_axis = through(x_hardness, axis)
+    return from_axis.convert(to_axis.convert(value)[0])
+
+
+class Interpolator:
+    """Попарный интерполятор interp1d, который строится при первом обращении"""
+
+    __slots__ = ("x_hardness", "y_hardness", "kind", "name")
+
+    def __init__(self, x_hardness: str, y_hardness: str, kind: int = 1) -> None:
+        self.x_hardness, self.y_hardness, self.kind = x_hardness, y_hardness, kind
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance, owner):
+        function = interpolate(self.x_hardness, self.y_hardness, kind=self.kind)
+        setattr(owner, self.name, function)  # дальше - обычный атрибут класса
+        return function
+
+
 class Hardness:
     """Твердость"""
 
-    __slots__ = ("HB", "HRA", "HRC", "HRB", "HV", "HSD")
-
-    HB_HRA = interpolate("HB", "HRA", kind=1)
-    HB_HRC = interpolate("HB", "HRC", kind=1)
-    HB_HRB = interpolate("HB", "HRB", kind=1)
-    HB_HV = interpolate("HB", "HV", kind=1)
-    HB_HSD = interpolate("HB", "HSD", kind=1)
-
-    HRA_HB = interpolate("HRA", "HB", kind=1)
-    HRA_HRC = interpolate("HRA", "HRC", kind=1)
-    HRA_HRB = interpolate("HRA", "HRB", kind=1)
-    HRA_HV = interpolate("HRA", "HV", kind=1)
-    HRA_HSD = interpolate("HRA", "HSD", kind=1)
-
-    HRC_HB = interpolate("HRC", "HB", kind=1)
-    HRC_HRA = interpolate("HRC", "HRA", kind=1)
-    HRC_HRB = interpolate("HRC", "HRB", kind=1)
-    HRC_HV = interpolate("HRC", "HV", kind=1)
-    HRC_HSD = interpolate("HRC", "HSD", kind=1)
-
-    HRB_HB = interpolate("HRB", "HB", kind=1)
-    HRB_HRA = interpolate("HRB", "HRA", kind=1)
-    HRB_HRC = interpolate("HRB", "HRC", kind=1)
-    HRB_HV = interpolate("HRB", "HV", kind=1)
-    HRB_HSD = interpolate("HRB", "HSD", kind=1)
-
-    HV_HB = interpolate("HV", "HB", kind=1)
-    HV_HRA = interpolate("HV", "HRA", kind=1)
-    HV_HRC = interpolate("HV", "HRC", kind=1)
-    HV_HRB = interpolate("HV", "HRB", kind=1)
-    HV_HSD = interpolate("HV", "HSD", kind=1)
-
-    HSD_HB = interpolate("HSD", "HB", kind=1)
-    HSD_HRA = interpolate("HSD", "HRA", kind=1)
-    HSD_HRC = interpolate("HSD", "HRC", kind=1)
-    HSD_HRB = interpolate("HSD", "HRB", kind=1)
-    HSD_HV = interpolate("HSD", "HV", kind=1)
+    __slots__ = SCALES
+
+    HB_HRA = Interpolator("HB", "HRA", kind=1)
+    HB_HRC = Interpolator("HB", "HRC", kind=1)
+    HB_HRB = Interpolator("HB", "HRB", kind=1)
+    HB_HV = Interpolator("HB", "HV", kind=1)
+    HB_HSD = Interpolator("HB", "HSD", kind=1)
+
+    HRA_HB = Interpolator("HRA", "HB", kind=1)
+    HRA_HRC = Interpolator("HRA", "HRC", kind=1)
+    HRA_HRB = Interpolator("HRA", "HRB", kind=1)
+    HRA_HV = Interpolator("HRA", "HV", kind=1)
+    HRA_HSD = Interpolator("HRA", "HSD", kind=1)
+
+    HRC_HB = Interpolator("HRC", "HB", kind=1)
+    HRC_HRA = Interpolator("HRC", "HRA", kind=1)
+    HRC_HRB = Interpolator("HRC", "HRB", kind=1)
+    HRC_HV = Interpolator("HRC", "HV", kind=1)
+    HRC_HSD = Interpolator("HRC", "HSD", kind=1)
+
+    HRB_HB = Interpolator("HRB", "HB", kind=1)
+    HRB_HRA = Interpolator("HRB", "HRA", kind=1)
+    HRB_HRC = Interpolator("HRB", "HRC", kind=1)
+    HRB_HV = Interpolator("HRB", "HV", kind=1)
+    HRB_HSD = Interpolator("HRB", "HSD", kind=1)
+
+    HV_HB = Interpolator("HV", "HB", kind=1)
+    HV_HRA = Interpolator("HV", "HRA", kind=1)
+    HV_HRC = Interpolator("HV", "HRC", kind=1)
+    HV_HRB = Interpolator("HV", "HRB", kind=1)
+    HV_HSD = Interpolator("HV", "HSD", kind=1)
+
+    HSD_HB = Interpolator("HSD", "HB", kind=1)
+    HSD_HRA = Interpolator("HSD", "HRA", kind=1)
+    HSD_HRC = Interpolator("HSD", "HRC", kind=1)
+    HSD_HRB = Interpolator("HSD", "HRB", kind=1)
+    HSD_HV = Interpolator("HSD", "HV", kind=1)
+
+    _lookup = staticmethod(lru_cache(maxsize=0)(lookup))  # кэш выключен
+
+    @classmethod
+    def set_cache(cls, maxsize: Optional[int] = 1024) -> None:
+        """LRU-кэш конвертации по (шкала, значение, ось): maxsize=0 - выключен, None - без ограничения"""
+        cls._lookup = staticmethod(lru_cache(maxsize=maxsize)(lookup))
+
+    @classmethod
+    def cache_info(cls):
+        """Статистика кэша конвертации: hits, misses, maxsize, currsize"""
+        return cls._lookup.cache_info()
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Очистка кэша конвертации"""
+        cls._lookup.cache_clear()
 
     @classmethod
     def validate(cls, **hardness: Dict[str, float]):
@@ -89,9 +239,9 @@ class Hardness:
             if not isinstance(v, (float, int)):
                 raise TypeError(f"{type(v)=} must be float")
 
-    def __init__(self, **hardness: Dict[str, float]):
+    def __init__(self, axis: Optional[str] = None, **hardness: Dict[str, float]):
         Hardness.validate(**hardness)
-        converted = Hardness.convert(**hardness)
+        converted = Hardness.convert(axis, **hardness)
         for k, v in converted.items():
             setattr(self, k, v)
 
@@ -100,69 +250,55 @@ class Hardness:
         return {k: getattr(self, k, nan) for k in self.__slots__}
 
     @classmethod
-    def convert(cls, **hardness: Dict[str, float]) -> Dict[str, float]:
+    def convert(cls, axis: Optional[str] = None, **hardness: Dict[str, float]) -> Dict[str, float]:
+        """
+        Конвертация твердости во все шкалы.
+
+        Args:
+            axis: None - попарные таблицы, D10MM - через общую ось диаметра отпечатка
+            hardness: Шкала и значение твердости
+        """
         cls.validate(**hardness)
-        for k, v in hardness.items():
-            match k:
-                case "HB":
-                    return {
-                        "HB": v,
-                        "HRA": float(cls.HB_HRA(v)),
-                        "HRC": float(cls.HB_HRC(v)),
-                        "HRB": float(cls.HB_HRB(v)),
-                        "HV": float(cls.HB_HV(v)),
-                        "HSD": float(cls.HB_HSD(v)),
-                    }
-                case "HRA":
-                    return {
-                        "HB": float(cls.HRA_HB(v)),
-                        "HRA": v,
-                        "HRC": float(cls.HRA_HRC(v)),
-                        "HRB": float(cls.HRA_HRB(v)),
-                        "HV": float(cls.HRA_HV(v)),
-                        "HSD": float(cls.HRA_HSD(v)),
-                    }
-                case "HRC":
-                    return {
-                        "HB": float(cls.HRC_HB(v)),
-                        "HRA": float(cls.HRC_HRA(v)),
-                        "HRC": v,
-                        "HRB": float(cls.HRC_HRB(v)),
-                        "HV": float(cls.HRC_HV(v)),
-                        "HSD": float(cls.HRC_HSD(v)),
-                    }
-                case "HRB":
-                    return {
-                        "HB": float(cls.HRB_HB(v)),
-                        "HRA": float(cls.HRB_HRA(v)),
-                        "HRC": float(cls.HRB_HRC(v)),
-                        "HRB": v,
-                        "HV": float(cls.HRB_HV(v)),
-                        "HSD": float(cls.HRB_HSD(v)),
-                    }
-                case "HV":
-                    return {
-                        "HB": float(cls.HV_HB(v)),
-                        "HRA": float(cls.HV_HRA(v)),
-                        "HRC": float(cls.HV_HRC(v)),
-                        "HRB": float(cls.HV_HRB(v)),
-                        "HV": v,
-                        "HSD": float(cls.HV_HSD(v)),
-                    }
-                case "HSD":
-                    return {
-                        "HB": float(cls.HSD_HB(v)),
-                        "HRA": float(cls.HSD_HRA(v)),
-                        "HRC": float(cls.HSD_HRC(v)),
-                        "HRB": float(cls.HSD_HRB(v)),
-                        "HV": float(cls.HSD_HV(v)),
-                        "HSD": v,
-                    }
-                case _:
-                    raise KeyError(f"{hardness=} not in {cls.__slots__}")
+        ((scale, value),) = hardness.items()
+        # кэш хранит кортежи, словарь всегда новый
+        converted = dict(zip(cls.__slots__, cls._lookup(scale, value, axis)))
+        converted[scale] = value
+        return converted
+
+    @classmethod
+    def convert_array(
+        cls, axis: Optional[str] = None, **hardness: Dict[str, Union[Sequence[float], np.ndarray]]
+    ) -> np.ndarray:
+        """Векторизованная конвертация массива твердостей: массив (len(SCALES),) + shape (axis - как в convert)"""
+        if len(hardness) != 1:
+            raise ValueError(f"{len(hardness)=} must be 1")
+        ((scale, values),) = hardness.items()
+        if scale not in cls.__slots__:
+            raise KeyError(f"{scale=} not in {cls.__slots__}")
+        try:
+            values = np.array(values, dtype="float64")
+        except (TypeError, ValueError) as exception:
+            raise TypeError(f"{scale} values must be float array") from exception
+
+        if axis is None:
+            converted = tabulate(scale)(values)
+        else:
+            to_axis, from_axis = through(scale, axis)
+            converted = from_axis(to_axis(values)[0])
+        converted[cls.__slots__.index(scale)] = values  # без погрешности интерполяции
+        return converted
+
+    @classmethod
+    def convert_many(
+        cls, axis: Optional[str] = None, **hardness: Dict[str, Union[Sequence[float], np.ndarray]]
+    ) -> Dict[str, np.ndarray]:
+        """Векторизованная конвертация массива твердостей во все шкалы (axis - как в convert)"""
+        return dict(zip(cls.__slots__, cls.convert_array(axis, **hardness)))
 
 
 if __name__ == "__main__":
     h = Hardness(HB=229)
     print(h.values)
     print(Hardness.convert(HB=229))
+    print(Hardness.convert_many(HB=[229, 300, 1000]))
+    print(Hardness.convert(D10MM, HB=229))
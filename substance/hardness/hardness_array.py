@@ -0,0 +1,93 @@
+from typing import Dict, Iterator, Optional, Sequence, Union
+
+import numpy as np
+
+from .hardness import SCALES, Hardness
+
+
+class HardnessView:
+    """Одно значение массива твердостей без копирования данных"""
+
+    __slots__ = ("array", "index")
+
+    def __init__(self, array: "HardnessArray", index: int) -> None:
+        self.array = array
+        self.index = index
+
+    def __getattr__(self, scale: str) -> float:
+        if scale not in SCALES:
+            raise AttributeError(f"{scale=} not in {SCALES}")
+        return float(self.array.data[SCALES.index(scale), self.index])
+
+    @property
+    def values(self) -> Dict[str, float]:
+        return dict(zip(SCALES, self.array.data[:, self.index].tolist()))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.values})"
+
+
+class HardnessArray:
+    """Массив твердостей: все шкалы хранятся непрерывными столбцами float64"""
+
+    __slots__ = ("data",)  # (len(SCALES), n)
+
+    def __init__(self, axis: Optional[str] = None, **hardness: Dict[str, Union[Sequence[float], np.ndarray]]):
+        """
+        Конвертация одного столбца твердостей во все шкалы.
+
+        Args:
+            axis: Ось конвертации, как в Hardness.convert
+            hardness: Шкала и одномерный массив значений
+        """
+        data = Hardness.convert_array(axis, **hardness)
+        if data.ndim != 2:
+            raise ValueError(f"{data.ndim - 1=} must be 1")
+        self.data = data
+
+    @classmethod
+    def from_numpy(cls, data: np.ndarray) -> "HardnessArray":
+        """Обертка массива (len(SCALES), n) без конвертации и копирования"""
+        data = np.asarray(data, dtype="float64")
+        if data.ndim != 2 or len(data) != len(SCALES):
+            raise ValueError(f"{data.shape=} must be ({len(SCALES)}, n)")
+        array = object.__new__(cls)
+        array.data = data
+        return array
+
+    def __getattr__(self, scale: str) -> np.ndarray:
+        if scale not in SCALES:
+            raise AttributeError(f"{scale=} not in {SCALES}")
+        return self.data[SCALES.index(scale)]
+
+    def __len__(self) -> int:
+        return self.data.shape[1]
+
+    def __getitem__(self, key) -> Union[HardnessView, "HardnessArray"]:
+        """Целое - значение, срез - представление, маска и индексы - копия"""
+        if isinstance(key, (int, np.integer)):
+            index = range(len(self))[key]  # отрицательные индексы и IndexError
+            return HardnessView(self, index)
+        return HardnessArray.from_numpy(self.data[:, key])
+
+    def __iter__(self) -> Iterator[HardnessView]:
+        return (HardnessView(self, i) for i in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(n={len(self)})"
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """Шкала: столбец значений (представления, без копирования)"""
+        return dict(zip(SCALES, self.data))
+
+    def to_numpy(self) -> np.ndarray:
+        """Массив (n, len(SCALES)) - транспонированное представление, без копирования"""
+        return self.data.T
+
+
+if __name__ == "__main__":
+    hardness = HardnessArray(HB=[229, 300, 1000])
+    print(hardness, hardness.HRC)
+    for h in hardness[hardness.HRC > 0]:
+        print(h)
+    print(hardness.to_numpy())
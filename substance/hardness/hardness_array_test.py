@@ -0,0 +1,109 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+try:
+    from .hardness import D10MM, Hardness
+    from .hardness_array import HardnessArray, HardnessView
+except ImportError:
+    from substance.hardness.hardness import D10MM, Hardness
+    from substance.hardness.hardness_array import HardnessArray, HardnessView
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).uniform(100, 700, 10_000)
+
+
+class TestHardnessArray:
+    """Тесты для класса HardnessArray"""
+
+    def test_init(self, values):
+        """Тест инициализации массива твердостей"""
+        array = HardnessArray(HB=values)
+        assert len(array) == len(values)
+        assert array.data.shape == (len(Hardness.__slots__), len(values))
+        assert array.data.flags.c_contiguous
+        for scale, column in Hardness.convert_many(HB=values).items():
+            assert np.array_equal(getattr(array, scale), column, equal_nan=True)
+
+        through = HardnessArray(D10MM, HRC=[20, 30])
+        assert np.array_equal(through.HB, Hardness.convert_many(D10MM, HRC=[20, 30])["HB"])
+
+        with pytest.raises(ValueError):
+            HardnessArray(HB=229)
+        with pytest.raises(KeyError):
+            HardnessArray(HX=values)
+        with pytest.raises(AttributeError):
+            array.HX
+
+    def test_getitem(self, values):
+        """Тест индексации, срезов и масок"""
+        array = HardnessArray(HB=values)
+
+        view = array[-1]
+        assert isinstance(view, HardnessView)
+        assert view.HB == values[-1]
+        expected = Hardness.convert(HB=float(values[-1]))
+        assert view.values == pytest.approx(expected, nan_ok=True)
+        with pytest.raises(IndexError):
+            array[len(values)]
+
+        part = array[10:20]
+        assert len(part) == 10
+        assert np.shares_memory(part.data, array.data)
+
+        hard = array[array.HRC > 30]
+        assert len(hard) == np.count_nonzero(array.HRC > 30)
+        assert np.all(hard.HRC > 30)
+
+    def test_iter(self, values):
+        """Тест итерации"""
+        array = HardnessArray(HB=values[:100])
+        assert [h.HB for h in array] == values[:100].tolist()
+
+    def test_export(self, values):
+        """Тест выгрузки без копирования"""
+        array = HardnessArray(HB=values)
+        assert all(np.shares_memory(column, array.data) for column in array.to_dict().values())
+        assert array.to_numpy().shape == (len(values), len(Hardness.__slots__))
+        assert np.shares_memory(array.to_numpy(), array.data)
+        assert np.array_equal(HardnessArray.from_numpy(array.data).HB, array.HB)
+
+    def test_memory(self, values):
+        """Тест памяти: массив против списка объектов Hardness"""
+        tracemalloc.start()
+        objects = [Hardness(HB=v) for v in values.tolist()]
+        objects_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        array = HardnessArray(HB=values)
+        array_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        assert len(objects) == len(array)
+        assert array_memory < objects_memory / 4, f"{array_memory=} {objects_memory=}"
+
+    @pytest.mark.parametrize("container", ["list", "array"])
+    @pytest.mark.benchmark
+    def test_hardness_array_init(self, benchmark, values, container):
+        """Бенчмарк создания: массив против списка Hardness, пиковая память в extra_info"""
+
+        def benchfunc():
+            match container:
+                case "list":
+                    return [Hardness(HB=v) for v in values.tolist()]
+                case "array":
+                    return HardnessArray(HB=values)
+
+        tracemalloc.start()
+        benchfunc()
+        benchmark.extra_info["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        benchmark(benchfunc)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s", "-x"])
@@ -1,10 +1,15 @@
+import subprocess
+import sys
+from math import nan
+
+import numpy as np
 import pytest
 from numpy import isnan
 
 try:
-    from .hardness import Hardness, data
+    from .hardness import D10MM, Hardness, data, tabulate
 except ImportError:
-    from substance.hardness.hardness import Hardness, data
+    from substance.hardness.hardness import D10MM, Hardness, data, tabulate
 
 
 class TestHardness:
@@ -13,7 +18,7 @@ class TestHardness:
     def test_init(self):
         """Тест инициализации твердости"""
         for d in data:
-            del d["d10mm"]  # лишняя инфа
+            d = {k: v for k, v in d.items() if k != D10MM}  # лишняя инфа
             for key, value in d.items():
                 if value is None:
                     continue
@@ -31,6 +36,170 @@ class TestHardness:
 
         benchmark(benchfunc)
 
+    @pytest.mark.parametrize("scale", Hardness.__slots__)
+    def test_convert(self, scale):
+        """Тест скалярной конвертации против попарных интерполяторов interp1d"""
+        table = tabulate(scale)
+        values = np.concatenate([table.x, np.linspace(table.x[0] - 10, table.x[-1] + 10, 1_000)])
+        for value in values:
+            converted = Hardness.convert(**{scale: float(value)})
+            assert converted[scale] == value
+            for j, k in enumerate(Hardness.__slots__):
+                if k == scale:
+                    continue
+                expected = float(getattr(Hardness, f"{scale}_{k}")(value))
+                if isnan(expected):
+                    # interp1d теряет верхний узел, если в исходном столбце есть пропуски
+                    assert isnan(converted[k]) or value == table.hi[j], f"{scale}={value} -> {k}"
+                else:
+                    assert converted[k] == pytest.approx(expected, rel=1e-12), f"{scale}={value} -> {k}"
+
+        assert all(isnan(v) for k, v in Hardness.convert(**{scale: nan}).items() if k != scale)
+
+    @pytest.mark.benchmark
+    def test_hardness_convert(self, benchmark):
+        benchmark(Hardness.convert, HB=229.5)
+
+    @pytest.mark.benchmark
+    def test_hardness_table_convert(self, benchmark):
+        benchmark(tabulate("HB").convert, 229.5)
+
+    @pytest.mark.parametrize("scale", Hardness.__slots__)
+    def test_convert_many(self, scale):
+        """Тест векторизованной конвертации"""
+        values = [d[scale] for d in data if d[scale] is not None]
+        values = np.linspace(min(values) - 10, max(values) + 10, 1_000)
+        converted = Hardness.convert_many(**{scale: values})
+
+        assert set(converted) == set(Hardness.__slots__)
+        assert np.array_equal(converted[scale], values)
+        for i, value in enumerate(values):
+            for k, v in Hardness.convert(**{scale: value}).items():
+                if isnan(v):
+                    continue
+                assert converted[k][i] == pytest.approx(v, rel=1e-12), f"{scale}={value} -> {k}"
+
+        # вне диапазона
+        assert all(isnan(v[0]) and isnan(v[-1]) for k, v in converted.items() if k != scale)
+
+    @pytest.mark.parametrize("scale", Hardness.__slots__)
+    def test_convert_axis(self, scale):
+        """Тест конвертации через общую ось d10mm против попарных таблиц"""
+        table = tabulate(scale)
+        values = np.linspace(table.x[0], table.x[-1], 1_000)
+        pairwise = Hardness.convert_many(**{scale: values})
+        through = Hardness.convert_many(D10MM, **{scale: values})
+        for k in Hardness.__slots__:
+            both = ~isnan(pairwise[k]) & ~isnan(through[k])
+            assert through[k][both] == pytest.approx(pairwise[k][both], rel=0.005), f"{scale} -> {k}"
+
+        for value in values[::50]:
+            converted = Hardness.convert(D10MM, **{scale: value})
+            for k, v in converted.items():
+                assert v == pytest.approx(through[k][values == value][0], rel=1e-12, nan_ok=True)
+
+        for d in data:
+            if d[scale] is None:
+                continue
+            for k, v in Hardness(D10MM, **{scale: d[scale]}).values.items():
+                if not isnan(v) and d[k] is not None:
+                    assert v == pytest.approx(d[k], rel=0.02), f"{scale}={d[scale]} -> {k}={v}"
+
+        with pytest.raises(ValueError):
+            Hardness.convert("HB", **{scale: values[0]})
+
+    def test_convert_many_input(self):
+        """Тест входных данных векторизованной конвертации"""
+        assert Hardness.convert_many(HB=(229, 229))["HRC"].shape == (2,)
+        assert Hardness.convert_many(HB=np.full((3, 4), 229.0))["HRC"].shape == (3, 4)
+        assert Hardness.convert_many(HB=229)["HRC"] == pytest.approx(Hardness.convert(HB=229)["HRC"])
+        with pytest.raises(ValueError):
+            Hardness.convert_many(HB=[229], HRC=[20])
+        with pytest.raises(KeyError):
+            Hardness.convert_many(HX=[229])
+        with pytest.raises(TypeError):
+            Hardness.convert_many(HB=["hard"])
+
+    def test_cache(self):
+        """Тест LRU-кэша конвертации"""
+        expected = Hardness.convert(HB=229)
+        try:
+            Hardness.set_cache(maxsize=2)
+            assert Hardness.cache_info() == (0, 0, 2, 0)
+
+            converted = Hardness.convert(HB=229)
+            converted["HRC"] = 0  # изменение результата не портит кэш
+            assert Hardness.convert(HB=229) == expected
+            assert Hardness.convert(HB=229.0)["HB"] == 229.0
+            assert Hardness.cache_info() == (2, 1, 2, 1)
+
+            Hardness.convert(HB=300)
+            Hardness.convert(D10MM, HB=229)  # ось - часть ключа
+            assert Hardness.cache_info() == (2, 3, 2, 2)
+            Hardness.convert(HB=229)  # вытеснено
+            assert Hardness.cache_info().misses == 4
+
+            Hardness.cache_clear()
+            assert Hardness.cache_info() == (0, 0, 2, 0)
+        finally:
+            Hardness.set_cache(maxsize=0)
+
+        Hardness.convert(HB=229)
+        assert Hardness.cache_info().currsize == 0
+
+    @pytest.mark.parametrize("maxsize", [0, 1024])
+    @pytest.mark.benchmark
+    def test_hardness_convert_cache(self, benchmark, maxsize):
+        values = [float(v) for v in np.random.default_rng(0).choice(np.arange(100, 700, 0.5), 10_000)]
+
+        def benchfunc():
+            for value in values:
+                Hardness.convert(HB=value)
+
+        Hardness.set_cache(maxsize)
+        try:
+            benchmark(benchfunc)
+        finally:
+            Hardness.set_cache(maxsize=0)
+
+    def test_lazy_import(self):
+        """Тест ленивого импорта: scipy и таблицы не загружаются при импорте"""
+        code = (
+            "import sys, substance; "
+            "assert 'substance.hardness' not in sys.modules; "
+            "substance.Hardness.convert(HB=229); substance.Hardness.convert_many(HRC=[20]); "
+            "assert 'scipy' not in sys.modules; "
+            "assert type(substance.Hardness.__dict__['HB_HRA']).__name__ == 'Interpolator'; "
+            "substance.Hardness.HB_HRA(229); "
+            "assert 'scipy' in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    @pytest.mark.parametrize("module", ["substance", "substance.hardness"])
+    @pytest.mark.benchmark
+    def test_import_time(self, benchmark, module):
+        """Бенчмарк времени импорта (python -X importtime), us"""
+
+        def benchfunc():
+            stderr = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stderr
+            # import time: self [us] | cumulative [us] | module
+            for line in stderr.splitlines():
+                if line.split("|")[-1].strip() == module:
+                    return int(line.split("|")[1])
+
+        cumulative = benchmark.pedantic(benchfunc, rounds=5)
+        benchmark.extra_info["cumulative_us"] = cumulative
+
+    @pytest.mark.benchmark
+    def test_hardness_convert_many(self, benchmark):
+        values = np.random.default_rng(0).uniform(100, 700, 1_000_000)
+        benchmark(Hardness.convert_many, HB=values)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s", "-x"])
@@ -0,0 +1,194 @@
+import json
+import mmap
+import struct
+import zlib
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .substance import Substance
+from .table import SubstanceTable
+
+MAGIC = b"SUBSLIB\0"
+VERSION = 1
+# magic, версия, crc32 метаданных, crc32 данных, число веществ, компонентов, параметров, размер метаданных
+HEADER = struct.Struct("<8sIIIQIIQ")
+ALIGNMENT = 8
+
+
+def aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def write(path: str, substances: Union[Sequence[Substance], SubstanceTable]) -> None:
+    """
+    Запись библиотеки веществ в бинарный файл.
+
+    Формат (little-endian, блоки выровнены по 8 байт):
+        заголовок HEADER;
+        метаданные: JSON {"species": [...], "parameters": [...]};
+        смещения имен uint64 (n + 1) и имена UTF-8;
+        состав float64 (n, компоненты), 0 - компонента нет;
+        параметры float64 (n, параметры), NaN - не задан.
+    Функции не сохраняются.
+    """
+    if not isinstance(substances, SubstanceTable):
+        substances = SubstanceTable.from_substances(substances)
+    species, parameters = list(substances.species), list(substances.parameters)
+    metadata = json.dumps({"species": species, "parameters": parameters}).encode()
+    names = [name.encode() for name in substances.names]
+    offsets = np.cumsum([0] + [len(name) for name in names], dtype="<u8")
+    composition = np.ascontiguousarray(substances.composition, dtype="<f8")
+    values = np.empty((len(substances), len(parameters)), dtype="<f8")
+    for j, name in enumerate(parameters):
+        values[:, j] = substances.parameters[name]
+
+    blocks = [offsets.tobytes(), b"".join(names), composition.tobytes(), values.tobytes()]
+    data = b"".join(block + b"\0" * (aligned(len(block)) - len(block)) for block in blocks)
+    metadata += b" " * (aligned(HEADER.size + len(metadata)) - HEADER.size - len(metadata))
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        zlib.crc32(metadata),
+        zlib.crc32(data),
+        len(substances),
+        len(species),
+        len(parameters),
+        len(metadata),
+    )
+    with open(path, "wb") as file:
+        file.write(header + metadata + data)
+
+
+class Library:
+    """
+    Библиотека веществ в отображаемом в память файле (write).
+    Открытие не читает данные: вещества создаются при обращении,
+    процессы, открывшие один файл, разделяют физические страницы.
+    """
+
+    __slots__ = (
+        "path",
+        "file",
+        "buffer",
+        "species",
+        "parameters",
+        "functions",
+        "offsets",
+        "strings",
+        "composition",
+        "values",
+        "crc",
+        "index",
+    )
+
+    def __init__(self, path: str, functions: Optional[Dict[str, Callable]] = None) -> None:
+        """
+        Args:
+            path: Путь к файлу библиотеки
+            functions: Общие функции веществ
+        """
+        self.path = path
+        self.functions = dict(functions or {})
+        self.file = open(path, "rb")
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.__parse()
+        except Exception:
+            self.close()
+            raise
+
+    def __parse(self) -> None:
+        if len(self.buffer) < HEADER.size:
+            raise ValueError(f"{self.path}: not a substance library")
+        magic, version, crc_metadata, self.crc, n, k, p, size = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: not a substance library")
+        if version != VERSION:
+            raise ValueError(f"{self.path}: unsupported version {version}, expected {VERSION}")
+        metadata = self.buffer[HEADER.size : HEADER.size + size]
+        if zlib.crc32(metadata) != crc_metadata:
+            raise ValueError(f"{self.path}: metadata checksum mismatch")
+        metadata = json.loads(metadata)
+        self.species, self.parameters = tuple(metadata["species"]), tuple(metadata["parameters"])
+        if (len(self.species), len(self.parameters)) != (k, p):
+            raise ValueError(f"{self.path}: corrupted header")
+
+        position = HEADER.size + size
+        self.offsets = np.frombuffer(self.buffer, "<u8", n + 1, position)
+        position += aligned(self.offsets.nbytes)
+        self.strings = position  # начало блока имен
+        position += aligned(int(self.offsets[-1]))
+        self.composition = np.frombuffer(self.buffer, "<f8", n * k, position).reshape(n, k)
+        position += aligned(self.composition.nbytes)
+        self.values = np.frombuffer(self.buffer, "<f8", n * p, position).reshape(n, p)
+        self.index = None
+
+    def verify(self) -> None:
+        """Проверка контрольной суммы данных (читает весь файл)"""
+        start = HEADER.size + HEADER.unpack_from(self.buffer)[-1]
+        if zlib.crc32(self.buffer[start:]) != self.crc:
+            raise ValueError(f"{self.path}: data checksum mismatch")
+
+    def close(self) -> None:
+        """
+        Закрытие файла. composition и values - представления без копирования: если вызывающий
+        еще удерживает их, отображение остается открытым до сборки мусора и остается корректным.
+        """
+        try:
+            for attribute in ("offsets", "composition", "values"):  # представления удерживают буфер
+                if hasattr(self, attribute):
+                    delattr(self, attribute)
+            if hasattr(self, "buffer"):
+                try:
+                    self.buffer.close()
+                except BufferError:  # внешние представления: mmap закроется при сборке мусора
+                    pass
+        finally:
+            self.file.close()
+
+    def __enter__(self) -> "Library":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.composition)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.path!r}, n={len(self)}, species={len(self.species)}, parameters={len(self.parameters)})"
+
+    def name(self, i: int) -> str:
+        """Имя вещества по номеру"""
+        start, stop = self.offsets[i : i + 2].tolist()
+        return self.buffer[self.strings + start : self.strings + stop].decode()
+
+    def __getitem__(self, key: Union[int, str, slice]) -> Union[Substance, List[Substance]]:
+        """Вещество по номеру или имени, список веществ по срезу"""
+        if isinstance(key, slice):
+            return [self[i] for i in range(len(self))[key]]
+        if isinstance(key, str):
+            if self.index is None:
+                self.index = {self.name(i): i for i in range(len(self))}
+            key = self.index[key]
+        i = range(len(self))[key]
+        return Substance.trusted(
+            self.name(i),
+            {k: v for k, v in zip(self.species, self.composition[i].tolist()) if v > 0},
+            {k: v for k, v in zip(self.parameters, self.values[i].tolist()) if v == v},
+            dict(self.functions),
+        )
+
+    def __iter__(self) -> Iterator[Substance]:
+        return (self[i] for i in range(len(self)))
+
+    def table(self) -> SubstanceTable:
+        """Копия библиотеки в памяти процесса"""
+        return SubstanceTable(
+            [self.name(i) for i in range(len(self))],
+            self.species,
+            self.composition,
+            dict(zip(self.parameters, self.values.T)),
+            self.functions,
+        )
@@ -0,0 +1,130 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+try:
+    from .library import HEADER, Library, write
+    from .substance import Substance
+    from .table import SubstanceTable
+except ImportError:
+    from substance.library import HEADER, Library, write
+    from substance.substance import Substance
+    from substance.table import SubstanceTable
+
+
+def alloys(n: int):
+    rng = np.random.default_rng(0)
+    return [
+        Substance(
+            f"alloy-{i}",
+            {
+                "Fe": rng.uniform(0.5, 1),
+                "C": rng.uniform(0.001, 0.02),
+                **({"Cr": rng.uniform(0.1, 0.2)} if i % 2 else {}),
+            },
+            {"density": rng.uniform(7000, 8000), "HB": rng.uniform(100, 600), **({"E": 2e11} if i % 3 else {})},
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "alloys.lib")
+
+
+class TestLibrary:
+    """Тесты для отображаемой в память библиотеки веществ"""
+
+    def test_roundtrip(self, path):
+        substances = alloys(50) + [Substance("сталь", {"Fe": 1}), Substance("", {})]
+        write(path, substances)
+        functions = {"Cp": lambda T: 460 + 0.1 * T}
+        with Library(path, functions=functions) as library:
+            library.verify()
+            assert len(library) == len(substances)
+            for original, restored in zip(substances, library):
+                assert restored.name == original.name
+                assert restored.composition == pytest.approx(original.composition)
+                assert restored.parameters == original.parameters
+                assert restored.functions == functions
+            assert library["сталь"].composition == {"Fe": 1}
+            assert [s.name for s in library[-2:]] == ["сталь", ""]
+            table = library.table()
+            assert isinstance(table, SubstanceTable) and table.names[:2] == ["alloy-0", "alloy-1"]
+            assert np.isnan(table.parameters["E"][0])
+
+        write(path, SubstanceTable.from_substances(substances[:3]))
+        with Library(path) as library:
+            assert [s.name for s in library] == ["alloy-0", "alloy-1", "alloy-2"]
+
+    def test_close_with_views(self, path):
+        """Закрытие при удерживаемых представлениях не падает и закрывает файл"""
+        write(path, alloys(10))
+        with Library(path) as library:
+            composition = library.composition
+            file = library.file
+        assert file.closed
+        assert composition.shape == (10, 3) and composition[0].sum() == pytest.approx(1)
+
+    def test_corrupted(self, path):
+        write(path, alloys(10))
+        with open(path, "rb") as file:
+            data = bytearray(file.read())
+
+        def corrupt(position: int, value: bytes):
+            with open(path, "wb") as file:
+                file.write(data[:position] + value + data[position + len(value) :])
+
+        corrupt(0, b"NOTALIB!")
+        with pytest.raises(ValueError, match="not a substance library"):
+            Library(path)
+        corrupt(8, (99).to_bytes(4, "little"))
+        with pytest.raises(ValueError, match="version"):
+            Library(path)
+        corrupt(HEADER.size + 2, b"X")
+        with pytest.raises(ValueError, match="metadata checksum"):
+            Library(path)
+        corrupt(len(data) - 1, b"\xff")
+        with Library(path) as library:  # данные проверяются по запросу
+            with pytest.raises(ValueError, match="data checksum"):
+                library.verify()
+
+    @pytest.mark.benchmark
+    def test_library_open(self, benchmark, path):
+        write(path, alloys(20_000))
+
+        def benchfunc():
+            with Library(path) as library:
+                return library[12_345]
+
+        benchmark(benchfunc)
+
+    @pytest.mark.benchmark
+    def test_library_json_load(self, benchmark, tmp_path):
+        path = os.path.join(tmp_path, "alloys.json")
+        with open(path, "w") as file:
+            json.dump([[s.name, s.composition, s.parameters] for s in alloys(20_000)], file)
+
+        def benchfunc():
+            with open(path) as file:
+                substances = [Substance(*row) for row in json.load(file)]
+            return substances[12_345]
+
+        benchmark.pedantic(benchfunc, rounds=5)
+
+
+if __name__ == "__main__":
+    pytest.main(
+        [
+            __file__,
+            "-v",
+            "-s",
+            "-x",
+            "--benchmark-columns=mean,min,max,stddev,median,rounds,outliers",
+            "--benchmark-sort=name",
+            "--benchmark-min-rounds=10",
+        ]
+    )
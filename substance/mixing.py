@@ -0,0 +1,64 @@
+"""
+Векторизованное смешение потоков веществ.
+
+Потоки отображаются на общий индекс компонентов и параметров, после чего
+смешение N узлов из S потоков сводится к произведениям матриц весов (N, S)
+на матрицы состава (S, K) и параметров (S, P).
+"""
+
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+MASS_FLOW = "m"  # массовый расход: веса смешения по умолчанию, суммируется
+
+
+def keys(mappings: Iterable[Dict[str, float]]) -> Tuple[str, ...]:
+    """Общий индекс ключей в порядке первого появления"""
+    return tuple(dict.fromkeys(k for mapping in mappings for k in mapping))
+
+
+def matrix(mappings: Sequence[Dict[str, float]], index: Sequence[str], fill: float = 0.0) -> np.ndarray:
+    """Матрица (len(mappings), len(index)), отсутствующие значения - fill"""
+    result = np.full((len(mappings), len(index)), fill, dtype="float64")
+    position = {k: j for j, k in enumerate(index)}
+    for i, mapping in enumerate(mappings):
+        for k, v in mapping.items():
+            result[i, position[k]] = v
+    return result
+
+
+def common(mappings: Sequence[Dict[str, Callable]]) -> Dict[str, Callable]:
+    """Функции, одинаковые (один и тот же объект) во всех mappings"""
+    if not mappings:
+        return {}
+    return {k: f for k, f in mappings[0].items() if all(m.get(k) is f for m in mappings)}
+
+
+def mix(compositions: np.ndarray, parameters: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Смешение потоков.
+
+    Args:
+        compositions: Массовые доли компонентов потоков (S, K)
+        parameters: Параметры потоков (S, P), NaN - параметр не задан
+        weights: Массовые расходы потоков в каждый узел (N, S) или (S,)
+
+    Returns:
+        Массовые доли (N, K) и массово-средние параметры (N, P) узлов.
+        Параметр усредняется по потокам, где он задан; NaN - не задан ни в одном.
+    """
+    weights = np.asarray(weights, dtype="float64")
+    if np.any(weights < 0):
+        raise ValueError("weights must be >= 0")
+
+    fractions = weights @ compositions
+    total = fractions.sum(axis=-1, keepdims=True)
+    np.divide(fractions, total, out=fractions, where=total > 0)
+
+    given = ~np.isnan(parameters)
+    sums = weights @ np.where(given, parameters, 0.0)
+    counts = weights @ given
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    return fractions, means
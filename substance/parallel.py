@@ -0,0 +1,126 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .function import MemoizedFunction, NamedFunction, TabulatedFunction, register
+from .serialization import dumps_many, loads_many
+from .substance import Substance
+
+Job = Tuple[Substance, str, Dict[str, np.ndarray]]  # вещество, функция, аргументы
+
+_substances: List[Substance] = []  # вещества процесса-исполнителя
+_buffers: Dict[str, shared_memory.SharedMemory] = {}  # открытые буферы процесса-исполнителя
+
+
+def registry(substances: Sequence[Substance]) -> Dict[str, Callable]:
+    """Зарегистрированные функции веществ: имя - исходная функция (в том числе внутри оберток)"""
+    functions = {}
+    for substance in substances:
+        for function in substance.functions.values():
+            while isinstance(function, (NamedFunction, MemoizedFunction, TabulatedFunction)):
+                if isinstance(function, NamedFunction):
+                    functions[function.name] = function.function
+                function = function.function
+    return functions
+
+
+def _initialize(functions: Dict[str, Callable], data: bytes) -> None:
+    """
+    Инициализация исполнителя: вещества передаются один раз, а не с каждой порцией.
+    Реестр передается явно: при запуске spawn исполнитель не наследует регистрации родителя.
+    """
+    global _substances
+    for name, function in functions.items():
+        register(name, function, replace=True)
+    _substances = loads_many(data)
+
+
+def _evaluate(buffer: str, size: int, offset: int, index: int, name: str, arguments, vectorized) -> None:
+    """Вычисление порции и запись результата в общий буфер"""
+    if buffer not in _buffers:
+        _buffers[buffer] = shared_memory.SharedMemory(name=buffer)
+    result = np.ndarray((size,), dtype="float64", buffer=_buffers[buffer].buf)
+    values = _substances[index].evaluate(name, vectorized=vectorized, **arguments)
+    result[offset : offset + values.size] = values.ravel()
+
+
+def evaluate_many(
+    jobs: Sequence[Job],
+    workers: Optional[int] = None,
+    chunk_size: int = 65536,
+    vectorized: Optional[bool] = None,
+    context=None,
+) -> List[np.ndarray]:
+    """
+    Вычисление функций многих веществ по массивам аргументов в пуле процессов.
+
+    Args:
+        jobs: Задания (вещество, название функции, аргументы)
+        workers: Число процессов, None - os.cpu_count(), 1 - последовательно в текущем процессе
+        chunk_size: Число точек в порции
+        vectorized: См. Substance.evaluate
+        context: Контекст multiprocessing (например get_context("spawn")), None - по умолчанию
+
+    Returns:
+        Результаты в порядке заданий формы broadcasting аргументов.
+        Функции веществ должны быть зарегистрированы (function.register), а исходные функции -
+        импортируемы по имени (определены на уровне модуля).
+    """
+    if chunk_size < 1:
+        raise ValueError(f"{chunk_size=} must be >= 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"{workers=} must be >= 1")
+
+    shapes, flat = [], []
+    for substance, name, arguments in jobs:
+        if name not in substance.functions:
+            raise KeyError(f"{substance.name} has no function {name!r}")
+        arrays = np.broadcast_arrays(*map(np.asarray, arguments.values()))
+        shapes.append(np.broadcast_shapes(*(a.shape for a in arrays)))
+        flat.append({k: a.ravel() for k, a in zip(arguments, arrays)})
+    sizes = [int(np.prod(shape)) for shape in shapes]
+    offsets = np.cumsum([0] + sizes).tolist()
+
+    if workers == 1 or offsets[-1] <= chunk_size:  # последовательно
+        return [substance.evaluate(name, vectorized=vectorized, **arguments) for substance, name, arguments in jobs]
+
+    # одинаковые вещества передаются исполнителям один раз
+    substances, indices = [], {}
+    for substance, _, _ in jobs:
+        indices.setdefault(id(substance), len(substances))
+        if len(substances) < len(indices):
+            substances.append(substance)
+    data = dumps_many(substances)
+    functions = registry(substances)
+
+    buffer = shared_memory.SharedMemory(create=True, size=max(offsets[-1], 1) * 8)
+    try:
+        with ProcessPoolExecutor(
+            workers, mp_context=context, initializer=_initialize, initargs=(functions, data)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _evaluate,
+                    buffer.name,
+                    offsets[-1],
+                    offset + start,
+                    indices[id(substance)],
+                    name,
+                    {k: a[start : start + chunk_size] for k, a in arguments.items()},
+                    vectorized,
+                )
+                for (substance, name, _), arguments, offset, size in zip(jobs, flat, offsets, sizes)
+                for start in range(0, size, chunk_size)
+            ]
+            for future in futures:
+                future.result()  # исключения исполнителей
+        result = np.ndarray((offsets[-1],), dtype="float64", buffer=buffer.buf)
+        return [result[start:stop].reshape(shape).copy() for start, stop, shape in zip(offsets, offsets[1:], shapes)]
+    finally:
+        buffer.close()
+        buffer.unlink()
@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+from math import sqrt
+
+import numpy as np
+import pytest
+
+try:
+    from .function import REGISTRY, register
+    from .parallel import evaluate_many
+    from .substance import Substance
+except ImportError:
+    from substance.function import REGISTRY, register
+    from substance.parallel import evaluate_many
+    from substance.substance import Substance
+
+
+def heat_capacity(T):
+    return 1000 + 0.1 * T
+
+
+def conductivity(T, P):
+    return 0.02 + 1e-5 * T + 1e-8 * P
+
+
+def scalar_only(T):
+    return sqrt(T)
+
+
+@pytest.fixture
+def substances():
+    functions = {
+        "Cp": register("test.parallel.Cp", heat_capacity),
+        "k": register("test.parallel.k", conductivity),
+        "sqrt": register("test.parallel.sqrt", scalar_only),
+    }
+    yield [Substance(f"s{i}", {"N2": 1}, {"m": float(i)}, functions) for i in range(3)]
+    for function in functions.values():
+        del REGISTRY[function.name]
+
+
+class TestEvaluateMany:
+    """Тесты для пакетного вычисления в пуле процессов"""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_evaluate_many(self, substances, workers):
+        T = np.linspace(300, 2000, 1001)
+        P = np.array([1e5, 2e5])[:, None]
+        jobs = [
+            (substances[0], "Cp", {"T": T}),
+            (substances[1], "k", {"T": T, "P": P}),
+            (substances[2], "sqrt", {"T": T[:10]}),
+            (substances[0], "Cp", {"T": 500.0}),
+        ]
+        results = evaluate_many(jobs, workers=workers, chunk_size=128)
+        assert [r.shape for r in results] == [(1001,), (2, 1001), (10,), ()]
+        assert np.array_equal(results[0], heat_capacity(T))
+        assert np.array_equal(results[1], conductivity(T, P))
+        assert np.allclose(results[2], np.sqrt(T[:10]))
+        assert results[3] == heat_capacity(500.0)
+
+    def test_spawn(self, substances):
+        """Исполнители spawn не наследуют реестр: функции регистрируются в фикстуре, а не при импорте"""
+        T = np.linspace(300, 2000, 100)
+        s = substances[0]
+        s.memoize("Cp")
+        s.compile("sqrt", (1, 4000), rtol=1e-4)
+        jobs = [(s, "Cp", {"T": T}), (s, "k", {"T": T, "P": 1e5}), (s, "sqrt", {"T": T})]
+        results = evaluate_many(jobs, workers=2, chunk_size=10, context=multiprocessing.get_context("spawn"))
+        assert np.array_equal(results[0], heat_capacity(T))
+        assert np.array_equal(results[1], conductivity(T, 1e5))
+        assert np.allclose(results[2], np.sqrt(T), rtol=1e-4)
+
+    def test_validation(self, substances):
+        with pytest.raises(KeyError):
+            evaluate_many([(substances[0], "missing", {"T": 1})])
+        with pytest.raises(ValueError):
+            evaluate_many([], workers=0)
+        with pytest.raises(ValueError):
+            evaluate_many([], chunk_size=0)
+        assert evaluate_many([], workers=2) == []
+
+    def test_errors(self, substances):
+        """Исключения исполнителей передаются вызывающему"""
+        with pytest.raises(ValueError):
+            evaluate_many([(substances[2], "sqrt", {"T": np.linspace(-1, 1, 100)})], workers=2, chunk_size=10)
+
+    def test_unregistered(self):
+        s = Substance("air", {"N2": 1}, functions={"Cp": lambda T: T})
+        with pytest.raises(TypeError):
+            evaluate_many([(s, "Cp", {"T": np.arange(10.0)})], workers=2, chunk_size=2)
+
+    @pytest.mark.parametrize("workers", sorted({1, 2, os.cpu_count() or 1}))
+    @pytest.mark.benchmark
+    def test_evaluate_many_workers(self, benchmark, substances, workers):
+        T = np.linspace(300, 2000, 20_000)
+        jobs = [(s, "sqrt", {"T": T}) for s in substances]
+        benchmark.pedantic(evaluate_many, (jobs, workers, 10_000), rounds=3)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s", "-x"])
@@ -0,0 +1,154 @@
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .substance import Substance
+
+FUNCTION = "function."  # префикс функций веществ: function.<название>
+
+_stats: Dict[str, List] = {}  # операция: [вызовы, секунды]
+_originals: Dict[Tuple[type, str], object] = {}  # (класс, атрибут): исходный атрибут класса
+
+
+def record(name: str, seconds: float) -> None:
+    """Учет одного вызова операции"""
+    entry = _stats.get(name)
+    if entry is None:
+        entry = _stats[name] = [0, 0.0]
+    entry[0] += 1
+    entry[1] += seconds
+
+
+def timed(name: str, method: Callable) -> Callable:
+    """Обертка с замером времени"""
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            record(name, perf_counter() - start)
+
+    return wrapper
+
+
+def evaluate(method: Callable) -> Callable:
+    """Substance.evaluate: время по названию функции"""
+
+    @wraps(method)
+    def wrapper(self, name: str, *args, **kwargs):
+        start = perf_counter()
+        try:
+            return method(self, name, *args, **kwargs)
+        finally:
+            record(FUNCTION + name, perf_counter() - start)
+
+    return wrapper
+
+
+def refresh(method: Callable) -> Callable:
+    """Substance.refresh: время только пересчитанных функций"""
+
+    @wraps(method)
+    def wrapper(self, names: Optional[Sequence[str]] = None) -> Dict[str, float]:
+        values = {}
+        for name in self.functions if names is None else names:
+            derived = getattr(self, "_derived", None) or {}
+            entry = derived.get(name)
+            start = perf_counter()
+            values.update(method(self, [name]))
+            seconds = perf_counter() - start
+            if self._derived.get(name) is not entry:  # пересчитана
+                record(FUNCTION + name, seconds)
+        return values
+
+    return wrapper
+
+
+def targets() -> List[Tuple[type, str, Callable]]:
+    """(класс, атрибут, обертка) инструментируемых операций"""
+    from .hardness.hardness import Hardness
+
+    return [
+        (Substance, "__setattr__", lambda m: timed("Substance.__setattr__", m)),
+        (Substance, "normalize", lambda m: timed("Substance.normalize", m)),
+        (Substance, "__deepcopy__", lambda m: timed("Substance.__deepcopy__", m)),
+        (Substance, "evaluate", evaluate),
+        (Substance, "refresh", refresh),
+        (Hardness, "convert", lambda m: timed("Hardness.convert", m)),
+        (Hardness, "convert_array", lambda m: timed("Hardness.convert_array", m)),
+    ]
+
+
+def enable() -> None:
+    """
+    Включение: подмена методов классов обертками с замером времени.
+    Выключенное профилирование ничего не стоит - методы исходные.
+    """
+    if _originals:
+        return
+    for cls, attribute, wrapper in targets():
+        original = vars(cls)[attribute]
+        if isinstance(original, (staticmethod, classmethod)):
+            patched = type(original)(wrapper(original.__func__))
+        else:
+            patched = wrapper(original)
+        _originals[cls, attribute] = original
+        setattr(cls, attribute, patched)
+
+
+def disable() -> None:
+    """Выключение: возврат исходных методов, накопленная статистика сохраняется"""
+    while _originals:
+        (cls, attribute), original = _originals.popitem()
+        setattr(cls, attribute, original)
+
+
+def enabled() -> bool:
+    return bool(_originals)
+
+
+def snapshot() -> Dict[str, Tuple[int, float]]:
+    """Статистика: операция: (вызовы, секунды)"""
+    return {name: (calls, seconds) for name, (calls, seconds) in _stats.items()}
+
+
+def reset() -> None:
+    _stats.clear()
+
+
+@contextmanager
+def profile() -> Iterator[Dict[str, Tuple[int, float]]]:
+    """
+    Измерения внутри блока; словарь заполняется при выходе.
+
+    Example:
+        with profiling.profile() as stats:
+            solver.run()
+        print(profiling.report(stats))
+    """
+    before = snapshot()
+    was_enabled = enabled()
+    enable()
+    stats = {}
+    try:
+        yield stats
+    finally:
+        if not was_enabled:
+            disable()
+        for name, (calls, seconds) in snapshot().items():
+            calls0, seconds0 = before.get(name, (0, 0.0))
+            if calls != calls0:
+                stats[name] = (calls - calls0, seconds - seconds0)
+
+
+def report(stats: Optional[Dict[str, Tuple[int, float]]] = None) -> str:
+    """Таблица статистики по убыванию времени"""
+    stats = snapshot() if stats is None else stats
+    width = max(map(len, stats), default=9)
+    lines = [f"{'operation':<{width}} {'calls':>10} {'total, s':>12} {'per call, us':>14}"]
+    for name, (calls, seconds) in sorted(stats.items(), key=lambda item: -item[1][1]):
+        lines.append(f"{name:<{width}} {calls:>10} {seconds:>12.6f} {seconds / calls * 1e6:>14.3f}")
+    return "\n".join(lines)
@@ -0,0 +1,110 @@
+from copy import deepcopy
+
+import numpy as np
+import pytest
+
+try:
+    from . import profiling
+    from .hardness import Hardness
+    from .substance import Substance
+except ImportError:
+    from substance import Hardness, Substance, profiling
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    profiling.disable()
+    profiling.reset()
+    yield
+    profiling.disable()
+    profiling.reset()
+
+
+def water():
+    return Substance(
+        "Water",
+        {"H": 2 / 3, "O": 1 / 3},
+        {"TT": 300.0, "PP": 1e5},
+        {"Cp": lambda TT: 4186 + 0.1 * TT, "k": lambda PP: 0.6 + 1e-8 * PP},
+    )
+
+
+class TestProfiling:
+    """Тесты для профилирования горячих путей"""
+
+    def test_disabled(self):
+        """Выключенное профилирование не оставляет оберток"""
+        originals = {name: vars(Substance)[name] for name in ("__setattr__", "normalize", "__deepcopy__", "refresh")}
+        convert = vars(Hardness)["convert"]
+        profiling.enable()
+        assert profiling.enabled() and vars(Substance)["__setattr__"] is not originals["__setattr__"]
+        profiling.enable()  # повторное включение
+        profiling.disable()
+        assert not profiling.enabled()
+        assert {name: vars(Substance)[name] for name in originals} == originals
+        assert vars(Hardness)["convert"] is convert
+
+        deepcopy(water())
+        assert profiling.snapshot() == {}
+
+    def test_counts(self):
+        profiling.enable()
+        s = water()
+        deepcopy(s)
+        s.refresh()
+        s.refresh()  # без пересчета
+        s.parameters["TT"] = 400.0
+        s.refresh()
+        s.evaluate("k", PP=np.linspace(1e5, 2e5, 10))
+        Hardness.convert(HB=229)
+        profiling.disable()
+
+        stats = profiling.snapshot()
+        assert stats["Substance.__setattr__"][0] == 4
+        assert stats["Substance.normalize"][0] == 1
+        assert stats["Substance.__deepcopy__"][0] == 1
+        assert stats["function.Cp"][0] == 2 and stats["function.k"][0] == 2
+        assert stats["Hardness.convert"][0] == 1
+        assert all(seconds >= 0 for _, seconds in stats.values())
+        assert "Substance.__setattr__" in profiling.report()
+
+        profiling.reset()
+        assert profiling.snapshot() == {}
+
+    def test_profile(self):
+        water()
+        with profiling.profile() as stats:
+            water()
+            assert stats == {}
+        assert stats["Substance.__setattr__"][0] == 4 and not profiling.enabled()
+
+        profiling.enable()
+        with profiling.profile() as stats:
+            deepcopy(water())
+        assert stats["Substance.__deepcopy__"][0] == 1 and profiling.enabled()
+        assert profiling.snapshot()["Substance.__setattr__"][0] == 8
+
+    @pytest.mark.parametrize("mode", ["disabled", "enabled"])
+    @pytest.mark.benchmark
+    def test_profiling_overhead(self, benchmark, mode):
+        """Накладные расходы на создание вещества"""
+        if mode == "enabled":
+            profiling.enable()
+        else:  # после включения и выключения
+            profiling.enable()
+            profiling.disable()
+        benchmark(water)
+
+
+if __name__ == "__main__":
+    pytest.main(
+        [
+            __file__,
+            "-v",
+            "-s",
+            "-x",
+            "--benchmark-columns=mean,min,max,stddev,median,rounds,outliers",
+            "--benchmark-sort=name",
+            "--benchmark-min-rounds=10",
+        ]
+    )
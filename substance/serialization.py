@@ -0,0 +1,77 @@
+import pickle
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from . import mixing
+from .substance import Substance
+
+FORMAT = 1  # версия пакетного формата
+
+
+def dumps(substance: Substance) -> bytes:
+    """Сериализация вещества; функции - ссылками на реестр (function.register)"""
+    try:
+        return pickle.dumps(substance, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError) as exception:
+        raise TypeError(
+            f"{substance.name}: functions must be registered with substance.function.register"
+        ) from exception
+
+
+def loads(data: bytes) -> Substance:
+    return pickle.loads(data)
+
+
+def dumps_many(substances: Sequence[Substance]) -> bytes:
+    """
+    Пакетная сериализация по столбцам: состав и параметры - матрицы float64,
+    одинаковые функции и наборы функций хранятся один раз.
+    Параметры восстанавливаются как float.
+    """
+    species = mixing.keys(s.composition for s in substances)
+    parameters = mixing.keys(s.parameters for s in substances)
+
+    functions: Dict[int, int] = {}  # id функции: индекс
+    pool, layouts, layout = [], {}, []
+    for s in substances:
+        items = []
+        for key, function in s.functions.items():
+            if id(function) not in functions:
+                functions[id(function)] = len(pool)
+                pool.append(function)
+            items.append((key, functions[id(function)]))
+        layout.append(layouts.setdefault(tuple(items), len(layouts)))
+
+    batch = (
+        FORMAT,
+        [type(s) for s in substances],
+        [s.name for s in substances],
+        species,
+        mixing.matrix([s.composition for s in substances], species),
+        parameters,
+        mixing.matrix([s.parameters for s in substances], parameters, fill=np.nan),
+        pool,
+        list(layouts),
+        layout,
+    )
+    try:
+        return pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError) as exception:
+        raise TypeError("functions must be registered with substance.function.register") from exception
+
+
+def loads_many(data: bytes) -> List[Substance]:
+    version, types, names, species, fractions, parameters, values, pool, layouts, layout = pickle.loads(data)
+    if version != FORMAT:
+        raise ValueError(f"Unsupported format {version}, expected {FORMAT}")
+    layouts = [{key: pool[i] for key, i in items} for items in layouts]
+    return [
+        cls.trusted(
+            name,
+            {k: v for k, v in zip(species, row) if v > 0},
+            {k: v for k, v in zip(parameters, row_values) if v == v},
+            dict(layouts[i]),
+        )
+        for cls, name, row, row_values, i in zip(types, names, fractions.tolist(), values.tolist(), layout)
+    ]
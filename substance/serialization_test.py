@@ -0,0 +1,93 @@
+import pickle
+
+import pytest
+
+try:
+    from .function import REGISTRY, register
+    from .serialization import dumps, dumps_many, loads, loads_many
+    from .substance import FrozenSubstance, Substance
+except ImportError:
+    from substance.function import REGISTRY, register
+    from substance.serialization import dumps, dumps_many, loads, loads_many
+    from substance.substance import FrozenSubstance, Substance
+
+
+@pytest.fixture
+def functions():
+    functions = {
+        "Cp": register("test.Cp", lambda T: 1000 + 0.1 * T),
+        "k": register("test.k", lambda T: 1.4 - 1e-5 * T),
+    }
+    yield functions
+    for function in functions.values():
+        del REGISTRY[function.name]
+
+
+def population(n, functions):
+    return [
+        Substance(f"s{i}", {"N2": 0.77, "O2": 0.23}, {"m": 1.0 + i, "TT": 300.0 + i}, dict(functions)) for i in range(n)
+    ]
+
+
+def assert_same(a: Substance, b: Substance):
+    assert type(a) is type(b)
+    assert a.name == b.name
+    assert a.composition == pytest.approx(b.composition)
+    assert a.parameters == b.parameters
+    assert a.functions == b.functions
+
+
+class TestSerialization:
+    """Тесты для сериализации веществ"""
+
+    def test_single(self, functions):
+        s = Substance("air", {"N2": 0.77, "O2": 0.23}, {"m": 1, "TT": 300.0}, functions)
+        restored = loads(dumps(s))
+        assert_same(s, restored)
+        assert restored.functions["Cp"] is functions["Cp"]
+        assert_same(s.freeze(), loads(dumps(s.freeze())))
+
+        with pytest.raises(TypeError):
+            dumps(Substance("air", functions={"Cp": lambda T: T}))
+
+    def test_many(self, functions):
+        substances = population(10, functions) + [
+            Substance("water", {"H2O": 1}, {"PP": 1e5}),
+            FrozenSubstance("frozen", {"Ar": 1}, {"m": 2.0}, {"k": functions["k"]}),
+        ]
+        restored = loads_many(dumps_many(substances))
+        assert len(restored) == len(substances)
+        for a, b in zip(substances, restored):
+            assert_same(a, b)
+        assert loads_many(dumps_many([])) == []
+
+        with pytest.raises(TypeError):
+            dumps_many([Substance("air", functions={"Cp": lambda T: T})])
+
+    def test_compact(self, functions):
+        substances = population(1_000, functions)
+        assert len(dumps_many(substances)) < 0.6 * len(pickle.dumps(substances))
+
+    @pytest.mark.benchmark
+    def test_serialization_roundtrip(self, benchmark, functions):
+        substance = population(1, functions)[0]
+        benchmark(lambda: loads(dumps(substance)))
+
+    @pytest.mark.benchmark
+    def test_serialization_roundtrip_many(self, benchmark, functions):
+        substances = population(1_000, functions)
+        benchmark(lambda: loads_many(dumps_many(substances)))
+
+
+if __name__ == "__main__":
+    pytest.main(
+        [
+            __file__,
+            "-v",
+            "-s",
+            "-x",
+            "--benchmark-columns=mean,min,max,stddev,median,rounds,outliers",
+            "--benchmark-sort=name",
+            "--benchmark-min-rounds=10",
+        ]
+    )
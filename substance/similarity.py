@@ -0,0 +1,143 @@
+from math import log1p
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .substance import Substance
+
+
+def close(a: np.ndarray, b: np.ndarray, eps: float) -> np.ndarray:
+    """Поэлементно |a - b| <= eps * max(|a|, |b|); NaN не равен ничему"""
+    return np.abs(a - b) <= eps * np.maximum(np.abs(a), np.abs(b))
+
+
+def group_key(substance: Substance, composition: bool = True) -> Tuple[tuple, tuple]:
+    """Ключ группы: имена параметров и компонентов"""
+    return tuple(sorted(substance.parameters)), tuple(sorted(substance.composition)) if composition else ()
+
+
+def vector(substance: Substance, key: Tuple[tuple, tuple]) -> List[float]:
+    parameters, species = key
+    return [substance.parameters[k] for k in parameters] + [substance.composition[k] for k in species]
+
+
+class Group:
+    """Вещества с одинаковыми именами параметров и компонентов, отсортированные по одной координате"""
+
+    __slots__ = ("indices", "values", "column", "sign", "logarithm")
+
+    def __init__(self, indices: np.ndarray, values: np.ndarray) -> None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            logarithm = np.log(np.abs(values))
+        logarithm = np.where(np.isfinite(logarithm), logarithm, 0.0)  # нули и NaN сравниваются отдельно
+        if values.shape[1]:  # координата сортировки: меньше всего нулей, наибольший разброс
+            column = int(np.lexsort((-logarithm.std(axis=0), (values == 0).sum(axis=0)))[0])
+            sign, key = np.sign(values[:, column]), logarithm[:, column]
+        else:
+            column, sign, key = 0, np.zeros(len(values)), np.zeros(len(values))
+        order = np.lexsort((key, sign))
+        self.indices = indices[order]
+        self.values = values[order]
+        self.column = column
+        self.sign = sign[order]
+        self.logarithm = key[order]
+
+    def window(self, sign: float, logarithm: np.ndarray, width: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Границы [начало, конец) кандидатов с тем же знаком и |log x - logarithm| <= width"""
+        lo, hi = np.searchsorted(self.sign, sign, "left"), np.searchsorted(self.sign, sign, "right")
+        if sign != sign:  # NaN не равен ничему
+            lo = hi = len(self.sign)
+        if sign == 0 or lo == hi:  # нули сравниваются между собой полностью, пустой класс - без кандидатов
+            return np.full(np.shape(logarithm), lo), np.full(np.shape(logarithm), hi)
+        part = self.logarithm[lo:hi]
+        return lo + np.searchsorted(part, logarithm - width, "left"), lo + np.searchsorted(
+            part, logarithm + width, "right"
+        )
+
+
+class SimilarityIndex:
+    """
+    Индекс близких веществ: одинаковые имена параметров (и компонентов),
+    все значения отличаются не более чем на eps относительно большего по модулю.
+    Вещества группируются по ключу, в группе сортируются по одной координате
+    в логарифмическом масштабе и проверяются только в окне ширины -ln(1 - eps).
+    """
+
+    __slots__ = ("eps", "composition", "width", "substances", "groups")
+
+    def __init__(self, substances: Sequence[Substance], eps: float, composition: bool = True) -> None:
+        """
+        Args:
+            substances: Вещества
+            eps: Относительная погрешность, 0 <= eps < 1
+            composition: Сравнивать также химический состав
+        """
+        if not 0 <= eps < 1:
+            raise ValueError(f"{eps=} must be in [0..1)")
+        self.eps = eps
+        self.composition = composition
+        self.width = -log1p(-eps) * (1 + 1e-12)  # запас на округление
+        self.substances = list(substances)
+
+        rows: Dict[tuple, Tuple[List[int], List[List[float]]]] = {}
+        for i, substance in enumerate(self.substances):
+            key = group_key(substance, composition)
+            indices, values = rows.setdefault(key, ([], []))
+            indices.append(i)
+            values.append(vector(substance, key))
+        self.groups = {
+            key: Group(
+                np.array(indices), np.array(values, dtype="float64").reshape(len(indices), len(key[0]) + len(key[1]))
+            )
+            for key, (indices, values) in rows.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.substances)
+
+    def query(self, substance: Substance) -> List[int]:
+        """Индексы веществ, близких к substance"""
+        key = group_key(substance, self.composition)
+        group = self.groups.get(key)
+        if group is None:
+            return []
+        values = np.array(vector(substance, key), dtype="float64")
+        x = values[group.column] if len(values) else 0.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            start, stop = group.window(np.sign(x), np.log(np.abs(x)) if x == x and x else 0.0, self.width)
+        candidates = slice(int(start), int(stop))
+        ok = close(group.values[candidates], values, self.eps).all(axis=1)
+        return sorted(group.indices[candidates][ok].tolist())
+
+    def pairs(self) -> List[Tuple[int, int]]:
+        """Все пары близких веществ (i < j)"""
+        result = []
+        for group in self.groups.values():
+            for sign in np.unique(group.sign[group.sign == group.sign]):
+                lo, hi = np.searchsorted(group.sign, sign, "left"), np.searchsorted(group.sign, sign, "right")
+                starts = np.arange(lo, hi)
+                _, stops = group.window(sign, group.logarithm[lo:hi], self.width)
+                counts = stops - starts - 1  # кандидаты правее в окне
+                i = np.repeat(starts, counts)
+                j = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + i + 1
+                ok = close(group.values[i], group.values[j], self.eps).all(axis=1)
+                a, b = group.indices[i[ok]], group.indices[j[ok]]
+                result.extend(zip(np.minimum(a, b).tolist(), np.maximum(a, b).tolist()))
+        return sorted(result)
+
+    def clusters(self) -> List[List[int]]:
+        """Группы близких веществ (связные компоненты пар), не менее 2 веществ"""
+        parent = list(range(len(self)))
+
+        def root(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, j in self.pairs():
+            parent[root(j)] = root(i)
+        components: Dict[int, List[int]] = {}
+        for i in range(len(self)):
+            components.setdefault(root(i), []).append(i)
+        return sorted(c for c in components.values() if len(c) > 1)
@@ -0,0 +1,92 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+try:
+    from .similarity import SimilarityIndex
+    from .substance import Substance
+except ImportError:
+    from substance.similarity import SimilarityIndex
+    from substance.substance import Substance
+
+
+def library(n: int, duplicates: float = 0.1, eps: float = 1e-3, seed: int = 0):
+    """Синтетическая библиотека: случайные вещества и их близкие копии"""
+    rng = np.random.default_rng(seed)
+    originals = int(n * (1 - duplicates))
+    substances = []
+    for i in range(originals):
+        parameters = dict(zip(("TT", "PP", "m"), rng.uniform([200, -1e5, 0], [2000, 1e6, 100]).tolist()))
+        if i % 7 == 0:
+            parameters["k"] = 0.0
+        composition = {"N2": rng.uniform(0.1, 1), "O2": rng.uniform(0.1, 1)} if i % 2 else {"H2O": 1.0}
+        substances.append(Substance(f"s{i}", composition, parameters))
+    for i in rng.integers(0, originals, n - originals).tolist():
+        s = substances[i]
+        factor = 1 + rng.uniform(-0.4, 0.4) * eps
+        substances.append(s.evolve(name=f"d{i}", parameters={k: v * factor for k, v in s.parameters.items()}))
+    return substances
+
+
+class TestSimilarityIndex:
+    """Тесты для индекса близких веществ"""
+
+    @pytest.mark.parametrize("composition", [False, True])
+    def test_pairs(self, composition):
+        eps = 1e-3
+        substances = library(400, duplicates=0.2, eps=eps)
+        substances += [Substance("nan", {"N2": 1}, {"TT": float("nan")})] * 2
+        index = SimilarityIndex(substances, eps, composition=composition)
+        expected = [
+            (i, j)
+            for i, j in combinations(range(len(substances)), 2)
+            if substances[i].eq(substances[j], eps, composition=composition)
+        ]
+        assert len(expected) >= 80
+        assert index.pairs() == expected
+
+        for i in (0, 7, 399, 401):
+            near = sorted({j for pair in expected if i in pair for j in pair} | {i})
+            assert index.query(substances[i]) == (near if substances[i].eq(substances[i], eps) else [])
+
+    def test_clusters(self):
+        a = Substance("a", {"N2": 1}, {"TT": 300.0, "PP": -1e5})
+        substances = [
+            a,
+            a.evolve(parameters={"TT": 300.2}),
+            a.evolve(parameters={"TT": 300.4}),  # близок ко второму, но не к первому
+            a.evolve(parameters={"PP": 1e5}),
+            Substance("b", {"O2": 1}, {"TT": 300.0, "PP": -1e5}),
+            Substance("empty"),
+            Substance("empty"),
+        ]
+        index = SimilarityIndex(substances, 1e-3)
+        assert index.pairs() == [(0, 1), (1, 2), (5, 6)]
+        assert index.clusters() == [[0, 1, 2], [5, 6]]
+        assert index.query(Substance("b", {"O2": 1}, {"TT": 300.1, "PP": -1e5})) == [4]
+        assert index.query(Substance("c", {"Ar": 1})) == []
+        assert SimilarityIndex(substances, 1e-3, composition=False).clusters() == [[0, 1, 2, 4], [5, 6]]
+        with pytest.raises(ValueError):
+            SimilarityIndex(substances, 1)
+
+    @pytest.mark.parametrize("n", [10_000, 100_000])
+    @pytest.mark.benchmark
+    def test_similarity_clusters(self, benchmark, n):
+        substances = library(n)
+        clusters = benchmark.pedantic(lambda: SimilarityIndex(substances, 1e-3).clusters(), rounds=3)
+        assert sum(map(len, clusters)) >= 0.1 * n
+
+
+if __name__ == "__main__":
+    pytest.main(
+        [
+            __file__,
+            "-v",
+            "-s",
+            "-x",
+            "--benchmark-columns=mean,min,max,stddev,median,rounds,outliers",
+            "--benchmark-sort=name",
+            "--benchmark-min-rounds=10",
+        ]
+    )
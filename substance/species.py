@@ -0,0 +1,135 @@
+import json
+import os
+from functools import cache, lru_cache
+from typing import Dict, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import mixing
+
+"""
+Молярные массы: стандартные атомные массы IUPAC.
+Полиномы NASA из 7 коэффициентов: GRI-Mech 3.0, thermo30.dat.
+"""
+HERE = os.path.dirname(__file__)
+
+
+@cache
+def load() -> Dict:
+    """Чтение таблицы компонентов при первом обращении"""
+    with open(os.path.join(HERE, "species.json"), "r") as file:
+        data = json.load(file)
+    middles = {tuple(s["T"])[1] for s in data["species"].values() if "T" in s}
+    if len(middles) > 1:
+        raise ValueError(f"species.json: NASA polynomials must share the middle temperature, got {middles}")
+    return data
+
+
+@cache
+def arrays(species: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Молярные массы (K,), коэффициенты cp/R (K, 2, 5) и границы полиномов (K, 2); NaN - нет полинома"""
+    table = load()["species"]
+    unknown = [s for s in species if s not in table]
+    if unknown:
+        raise KeyError(f"Species {unknown} not in species table")
+    molar_mass = np.array([table[s]["M"] for s in species], dtype="float64")
+    coefficients = np.full((len(species), 2, 5), np.nan)
+    bounds = np.full((len(species), 2), np.nan)
+    for i, s in enumerate(species):
+        if "nasa7" in table[s]:
+            coefficients[i] = np.array(table[s]["nasa7"])[:, :5]
+            bounds[i] = table[s]["T"][0], table[s]["T"][-1]
+    for array in (molar_mass, coefficients, bounds):
+        array.flags.writeable = False  # кэш разделяется всеми вызовами
+    return molar_mass, coefficients, bounds
+
+
+class Mixtures:
+    """
+    Свойства смесей, вычисляемые по химическому составу и таблице компонентов.
+    n смесей задаются массовыми долями (n, K) по общему списку компонентов.
+    """
+
+    __slots__ = (
+        "species",
+        "fractions",
+        "molar_mass",
+        "gas_constant",
+        "mole_fractions",
+        "coefficients",
+        "middle",
+        "low",
+        "high",
+    )
+
+    def __init__(self, species: Sequence[str], fractions: np.ndarray) -> None:
+        """
+        Args:
+            species: Компоненты (K)
+            fractions: Массовые доли (n, K), строки нормализуются
+        """
+        self.species = tuple(species)
+        fractions = np.atleast_2d(np.array(fractions, dtype="float64"))
+        if fractions.shape[1:] != (len(self.species),):
+            raise ValueError(f"{fractions.shape=} must be (n, {len(self.species)})")
+        total = fractions.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.fractions = fractions / total
+
+        molar_mass, coefficients, bounds = arrays(self.species)
+        R = load()["R"]
+        moles = self.fractions / molar_mass  # моль на кг смеси
+        total_moles = moles.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.molar_mass = np.where(total_moles > 0, 1 / total_moles, np.nan)  # кг/моль, пустой состав - NaN
+            self.mole_fractions = moles / total_moles[:, None]
+        self.gas_constant = R / self.molar_mass  # Дж/(кг*К)
+        # cp смеси линеен по коэффициентам: один полином на смесь и диапазон, Дж/(кг*К)
+        used = self.fractions > 0
+        self.coefficients = np.einsum("nk,krc->nrc", np.where(used, moles, 0.0), np.nan_to_num(coefficients)) * R
+        missing = (used[:, :, None, None] & np.isnan(coefficients)[None]).any(axis=(1, 2, 3))
+        self.coefficients[missing] = np.nan  # нет полинома у компонента смеси
+        # общий диапазон полиномов компонентов смеси, К
+        self.low = np.where(used, bounds[:, 0], -np.inf).max(axis=1, initial=-np.inf)
+        self.high = np.where(used, bounds[:, 1], np.inf).min(axis=1, initial=np.inf)
+        self.middle = next((tuple(s["T"])[1] for s in load()["species"].values() if "T" in s), np.inf)
+
+    @classmethod
+    def from_compositions(cls, compositions: Sequence[Mapping[str, float]]) -> "Mixtures":
+        species = mixing.keys(compositions)
+        return cls(species, mixing.matrix(compositions, species))
+
+    def __len__(self) -> int:
+        return len(self.fractions)
+
+    def heat_capacity(self, temperature: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Изобарная теплоемкость смесей cp(T), Дж/(кг*К).
+        Вне диапазона полиномов [low, high] компонентов смеси - NaN, без экстраполяции.
+
+        Args:
+            temperature: Температура, К; broadcasting с (n,), например (n,) или (n, m) или (m, 1)
+        """
+        T = np.asarray(temperature, dtype="float64")
+        shape = np.broadcast_shapes(T.shape, (len(self),))
+        T = np.broadcast_to(T, shape)
+        c = np.broadcast_to(self.coefficients, shape[:-1] + self.coefficients.shape)
+        c = np.where((T >= self.middle)[..., None], c[..., 1, :], c[..., 0, :])  # выбор диапазона
+        cp = c[..., 0] + T * (c[..., 1] + T * (c[..., 2] + T * (c[..., 3] + T * c[..., 4])))
+        return np.where((self.low <= T) & (T <= self.high), cp, np.nan)
+
+
+@lru_cache(maxsize=1024)
+def _mixture(key: Tuple[Tuple[str, float], ...]) -> Mixtures:
+    species, fractions = zip(*key) if key else ((), ())
+    result = Mixtures(species, [fractions])
+    for name in Mixtures.__slots__:
+        value = getattr(result, name)
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False  # экземпляр разделяется всеми веществами с этим составом
+    return result
+
+
+def mixture(composition: Mapping[str, float]) -> Mixtures:
+    """Свойства одной смеси; кэшируется по составу, изменение состава дает новый ключ"""
+    return _mixture(tuple(sorted(composition.items())))
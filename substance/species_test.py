@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+try:
+    from .species import Mixtures, _mixture, load, mixture
+    from .substance import Substance
+    from .table import SubstanceTable
+except ImportError:
+    from substance.species import Mixtures, _mixture, load, mixture
+    from substance.substance import Substance
+    from substance.table import SubstanceTable
+
+
+@pytest.fixture
+def air():
+    return Substance("air", {"N2": 0.7553, "O2": 0.2314, "Ar": 0.0128, "CO2": 0.0005})
+
+
+class TestSpecies:
+    """Тесты для свойств смесей по таблице компонентов"""
+
+    def test_table(self):
+        """Полиномы непрерывны в средней температуре и близки к справочным cp/R при 300 К"""
+        reference = {"N2": 3.50, "O2": 3.54, "Ar": 2.5, "CO2": 4.48, "H2O": 4.04, "H2": 3.47, "CO": 3.51, "He": 2.5}
+        for name, data in load()["species"].items():
+            if "nasa7" not in data:
+                continue
+            low, high = np.array(data["nasa7"])[:, :5]
+            T = data["T"][1]
+            assert np.polyval(low[::-1], T) == pytest.approx(np.polyval(high[::-1], T), rel=1e-3)
+            assert np.polyval(low[::-1], 300) == pytest.approx(reference[name], abs=0.01)
+
+    def test_air(self, air):
+        assert air.molar_mass == pytest.approx(0.028964, rel=1e-4)
+        assert air.gas_constant == pytest.approx(287.06, rel=1e-4)
+        assert air.heat_capacity(300) == pytest.approx(1003.5, rel=1e-3)
+        assert air.heat_capacity(1500) == pytest.approx(1210, rel=1e-2)
+        assert air.heat_capacity(np.array([300.0, 1500.0])).shape == (2,)
+        assert np.isnan(air.heat_capacity([250.0, 4000.0])).all()  # N2: 300..5000 К, O2: 200..3500 К
+        assert air.heat_capacity(3500) == pytest.approx(1320, rel=1e-2)
+        x = air.mole_fractions
+        assert list(x) == list(air.composition)
+        assert x["N2"] == pytest.approx(0.7809, rel=1e-3) and sum(x.values()) == pytest.approx(1)
+        assert air.humidity == 0
+
+    def test_elements(self):
+        water = Substance("water", {"H": 2 * 1.00794 / 18.01528, "O": 15.9994 / 18.01528})
+        assert water.molar_mass == pytest.approx(0.01801528 / 3, rel=1e-6)  # 3 моля атомов на моль H2O
+        assert np.isnan(water.heat_capacity(300))  # у элементов нет полиномов
+        with pytest.raises(KeyError):
+            Substance("x", {"Unobtainium": 1}).molar_mass
+        assert np.isnan(Substance("empty").molar_mass)
+
+    def test_cache(self, air):
+        _mixture.cache_clear()
+        air.molar_mass, air.gas_constant, air.heat_capacity(300)
+        assert _mixture.cache_info().misses == 1 and _mixture.cache_info().hits == 2
+        assert mixture(dict(air.composition)) is mixture(air.composition)
+        with pytest.raises(ValueError):
+            mixture(air.composition).molar_mass[0] = 0  # общий экземпляр только для чтения
+
+        molar_mass = air.molar_mass
+        air.composition = {"N2": 1}  # новый состав - новый ключ кэша
+        assert air.molar_mass == pytest.approx(0.0280134) != molar_mass
+
+    def test_many(self, air):
+        substances = [air, Substance("steam", {"H2O": 1}), Substance("flue", {"N2": 0.7, "CO2": 0.2, "H2O": 0.1})]
+        mixtures = Mixtures.from_compositions([s.composition for s in substances])
+        assert len(mixtures) == 3
+        assert mixtures.low == pytest.approx([300, 200, 300]) and mixtures.high == pytest.approx([3500, 3500, 3500])
+        assert mixtures.molar_mass == pytest.approx([s.molar_mass for s in substances])
+        assert mixtures.gas_constant == pytest.approx([s.gas_constant for s in substances])
+        T = np.array([[300.0], [800.0], [1200.0]])
+        assert np.allclose(mixtures.heat_capacity(T), [[s.heat_capacity(t) for s in substances] for t in T[:, 0]])
+
+        table = SubstanceTable.from_substances(substances)
+        assert table.mixtures().heat_capacity(500.0) == pytest.approx(mixtures.heat_capacity(500.0))
+        with pytest.raises(ValueError):
+            Mixtures(["N2", "O2"], [1.0])
+
+    @pytest.mark.parametrize("cached", [False, True])
+    @pytest.mark.benchmark
+    def test_species_gas_constant(self, benchmark, air, cached):
+        if not cached:
+            _mixture.cache_clear()
+            benchmark(lambda: (_mixture.cache_clear(), air.gas_constant))
+        else:
+            benchmark(lambda: air.gas_constant)
+
+    @pytest.mark.benchmark
+    def test_species_heat_capacity_many(self, benchmark):
+        rng = np.random.default_rng(0)
+        fractions = rng.uniform(0, 1, (10_000, 4))
+        T = rng.uniform(300, 2000, 10_000)
+        benchmark(lambda: Mixtures(["N2", "O2", "CO2", "H2O"], fractions).heat_capacity(T))
+
+
+if __name__ == "__main__":
+    pytest.main(
+        [
+            __file__,
+            "-v",
+            "-s",
+            "-x",
+            "--benchmark-columns=mean,min,max,stddev,median,rounds,outliers",
+            "--benchmark-sort=name",
+            "--benchmark-min-rounds=10",
+        ]
+    )
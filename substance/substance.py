@@ -1,9 +1,13 @@
-from copy import deepcopy
 from math import nan
-from typing import Callable, Dict, Union
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
+from . import mixing
+from .function import MemoizedFunction, TabulatedFunction, dependencies
+from .species import mixture
+
 
 class Substance:
     """Вещество"""
@@ -13,6 +17,7 @@ class Substance:
         "composition",  # химический состав
         "parameters",  # параметры
         "functions",  # функции
+        "_derived",  # кэш производных свойств: название: (функция, зависимости, аргументы, значение)
     )
 
     def __init__(
@@ -36,6 +41,29 @@ class Substance:
         self.parameters: Dict[str, Union[float, int]] = parameters or {}
         self.functions: Dict[str, Callable] = functions or {}
 
+    @classmethod
+    def trusted(
+        cls,
+        name: str,
+        composition: Dict[str, float],
+        parameters: Dict[str, Union[int, float]],
+        functions: Dict[str, Callable],
+    ) -> "Substance":
+        """
+        Создание вещества из уже проверенных данных без валидации и нормализации.
+        Словари не копируются и становятся атрибутами вещества.
+        """
+        substance = cls.__new__(cls)
+        object.__setattr__(substance, "name", name)
+        object.__setattr__(substance, "composition", composition)
+        object.__setattr__(substance, "parameters", parameters)
+        object.__setattr__(substance, "functions", functions)
+        return substance
+
+    def freeze(self) -> "FrozenSubstance":
+        """Неизменяемая копия вещества"""
+        return FrozenSubstance.trusted(self.name, dict(self.composition), dict(self.parameters), dict(self.functions))
+
     def __validate_attribute(self, attribute: str, value: str | dict) -> str | dict:
         """Валидирование атрибутов"""
         if not isinstance(attribute, str):
@@ -56,6 +84,7 @@ class Substance:
             case "functions":
                 if not isinstance(value, dict):
                     raise TypeError(f"{attribute} must be a dict")
+                # кэш MemoizedFunction не сбрасывается: ключ - значения аргументов, новая функция - новый объект
                 return {k: self.__validate_function(k, v) for k, v in value.items()}
             case _:
                 raise AttributeError(f"'{attribute}' not in {self.__slots__}")
@@ -79,7 +108,7 @@ class Substance:
                 raise TypeError("Composition fractions must be numeric")
             if not (0 < fraction <= 1):
                 raise ValueError("Composition values must be in (0..1]")
-        composition = self.normalize(composition)
+        composition = self.normalize(dict(composition))  # словарь вызывающего не изменяется
         return composition
 
     def __validate_parameter(self, key: str, value: Union[int, float]) -> Union[int, float]:
@@ -108,39 +137,262 @@ class Substance:
     def __deepcopy__(self, memo):
         """
         Создает глубокую копию объекта Substance.
-        Обрабатывает:
-        - Копирование строки name
-        - Рекурсивное копирование словарей composition и parameters
-        - Корректную обработку callable-объектов в parameters
+        Словари копируются поверхностно и без повторной валидации:
+        ключи - строки, значения - числа и функции, которые не изменяются,
+        а общие кэши мемоизации функций не должны сбрасываться.
         """
-        new_obj = Substance.__new__(Substance)  # новый экземпляр без вызова __init__
-
-        # Копируем простые атрибуты в memo для предотвращения циклических ссылок
+        new_obj = type(self).trusted(self.name, dict(self.composition), dict(self.parameters), dict(self.functions))
+        new_obj.__inherit(self)
         memo[id(self)] = new_obj
+        return new_obj
+
+    def __reduce__(self):
+        """Сериализация: функции должны быть зарегистрированы (NamedFunction) или импортируемы"""
+        return type(self).trusted, (self.name, dict(self.composition), dict(self.parameters), dict(self.functions))
 
-        # Глубокое копирование каждого атрибута
-        new_obj.name = deepcopy(self.name, memo)
+    def _share(self, mapping: Dict) -> Dict:
+        """Словарь для нового вещества: изменяемое вещество не разделяет словари"""
+        return dict(mapping)
 
-        # Особое внимание словарям
-        new_obj.composition = {k: deepcopy(v, memo) for k, v in self.composition.items()}
-        new_obj.parameters = {k: deepcopy(v, memo) for k, v in self.parameters.items()}
-        new_obj.functions = {k: v for k, v in self.functions.items()}
+    def evolve(
+        self,
+        name: Optional[str] = None,
+        composition: Optional[Dict[str, float]] = None,
+        parameters: Optional[Dict[str, Union[int, float]]] = None,
+        functions: Optional[Dict[str, Callable]] = None,
+    ) -> "Substance":
+        """
+        Новое вещество того же типа с изменениями; проверяются только изменения.
 
+        Args:
+            name: Новое название
+            composition: Новый химический состав (заменяет прежний)
+            parameters: Изменяемые параметры (дополняют прежние)
+            functions: Изменяемые функции (дополняют прежние)
+        """
+        if name is None:
+            name = self.name
+        else:
+            name = self.__validate_attribute("name", name)
+        if composition is None:
+            composition = self._share(self.composition)
+        else:
+            composition = self.__validate_attribute("composition", composition)
+        if parameters is None:
+            parameters = self._share(self.parameters)
+        else:
+            parameters = {**self.parameters, **self.__validate_attribute("parameters", parameters)}
+        if functions is None:
+            functions = self._share(self.functions)
+        else:
+            functions = {**self.functions, **self.__validate_attribute("functions", functions)}
+        new_obj = type(self).trusted(name, composition, parameters, functions)
+        new_obj.__inherit(self)
         return new_obj
 
-    def eq(self, other, eps: float) -> bool:
-        if len(self.Parameters) != len(other.Parameters):
-            return False
+    def __inherit(self, other: "Substance") -> None:
+        """Перенос кэша производных свойств: записи проверяются по функции и аргументам"""
+        derived = getattr(other, "_derived", None)
+        if derived:
+            object.__setattr__(self, "_derived", dict(derived))
 
-        for parameter, value in self.Parameters.items():
-            v = other.Parameters.get(parameter)
-            if v is None:
-                return False
-            if abs(v - value) > eps * value:
-                return False
+    def dependents(self, parameter: str) -> List[str]:
+        """Функции, зависящие от параметра"""
+        return [name for name, function in self.functions.items() if parameter in dependencies(function).values()]
 
+    def refresh(self, names: Optional[Sequence[str]] = None) -> Dict[str, float]:
+        """
+        Значения производных свойств - функций, все зависимости которых есть в parameters.
+        Функция пересчитывается, только если изменились значения ее зависимостей или она сама.
+
+        Args:
+            names: Названия функций, None - все функции
+        """
+        derived = getattr(self, "_derived", None)
+        if derived is None:
+            derived = {}
+            object.__setattr__(self, "_derived", derived)
+        parameters = self.parameters
+        values = {}
+        for name in self.functions if names is None else names:
+            function = self.functions[name]
+            entry = derived.get(name)
+            if entry is not None and entry[0] is function:
+                depends = entry[1]
+            else:
+                entry, depends = None, dependencies(function)
+            if not all(p in parameters for p in depends.values()):
+                continue
+            arguments = tuple(parameters[p] for p in depends.values())
+            if entry is None or entry[2] != arguments:
+                value = function(**dict(zip(depends, arguments)))
+                entry = derived[name] = (function, depends, arguments, value)
+            values[name] = entry[3]
+        return values
+
+    def eq(self, other: "Substance", eps: float, composition: bool = False) -> bool:
+        """
+        Равенство с относительной погрешностью: |a - b| <= eps * max(|a|, |b|).
+
+        Args:
+            other: Сравниваемое вещество
+            eps: Относительная погрешность
+            composition: Сравнивать также химический состав
+        """
+        pairs = [(self.parameters, other.parameters)]
+        if composition:
+            pairs.append((self.composition, other.composition))
+        for mine, theirs in pairs:
+            if mine.keys() != theirs.keys():
+                return False
+            for key, value in mine.items():
+                v = theirs[key]
+                if not abs(v - value) <= eps * max(abs(v), abs(value)):
+                    return False
         return True
 
+    def evaluate(self, name: str, vectorized: Optional[bool] = None, chunk_size: int = 4096, **arguments) -> np.ndarray:
+        """
+        Вычисление функции по массивам аргументов с broadcasting NumPy.
+
+        Args:
+            name: Название функции из functions
+            vectorized: True - функция принимает массивы, False - поэлементно, None - определить вызовом
+            chunk_size: Размер порции поэлементного вычисления
+            arguments: Аргументы функции (скаляры или массивы)
+        """
+        function = self.functions[name]
+        arrays = dict(zip(arguments, np.broadcast_arrays(*map(np.asarray, arguments.values()))))
+        shape = np.broadcast_shapes(*(a.shape for a in arrays.values()))
+
+        if vectorized is not False:
+            try:
+                result = np.asarray(function(**arrays), dtype="float64")
+                return np.array(np.broadcast_to(result, shape))  # константа -> массив
+            except (TypeError, ValueError):
+                if vectorized:
+                    raise
+
+        # поэлементно порциями: питоновские скаляры, без промежуточного списка на весь массив
+        flat = {k: a.ravel() for k, a in arrays.items()}
+        size = int(np.prod(shape))
+        result = np.empty(size, dtype="float64")
+        for start in range(0, size, chunk_size):
+            chunk = {k: a[start : start + chunk_size].tolist() for k, a in flat.items()}
+            values = [dict(zip(chunk, v)) for v in zip(*chunk.values())] if chunk else [{}]
+            result[start : start + chunk_size] = [function(**v) for v in values]
+        return result.reshape(shape)
+
+    def compile(
+        self, name: str, domain: Tuple[float, float], rtol: float = 1e-6, out_of_domain: str = "clamp", **kwargs
+    ) -> TabulatedFunction:
+        """
+        Замена функции одного аргумента табличной аппроксимацией.
+
+        Args:
+            name: Название функции из functions
+            domain: Область табулирования (начало, конец)
+            rtol: Допустимая относительная погрешность
+            out_of_domain: Поведение вне domain: "clamp", "extrapolate", "raise"
+            kwargs: Прочие параметры TabulatedFunction
+        """
+        function = self.functions[name]
+        while isinstance(function, (TabulatedFunction, MemoizedFunction)):  # по исходной функции
+            function = function.function
+        tabulated = TabulatedFunction(function, domain, rtol=rtol, out_of_domain=out_of_domain, **kwargs)
+        self.functions = {**self.functions, name: tabulated}
+        return tabulated
+
+    def memoize(self, name: Optional[str] = None, maxsize: Optional[int] = 128) -> None:
+        """
+        Кэширование результатов функций по значениям аргументов.
+
+        Args:
+            name: Название функции из functions, None - все функции
+            maxsize: Размер LRU-кэша каждой функции, None - без ограничения, 0 - выключить кэш
+        """
+        names = list(self.functions) if name is None else [name]
+        functions = dict(self.functions)
+        for name in names:
+            function = functions[name]
+            if isinstance(function, MemoizedFunction):
+                function = function.function
+            functions[name] = function if maxsize == 0 else MemoizedFunction(function, maxsize)
+        self.functions = functions
+
+    def cache_info(self) -> Dict[str, tuple]:
+        """Статистика кэшей функций: название: (hits, misses, maxsize, currsize)"""
+        return {k: f.cache_info() for k, f in self.functions.items() if isinstance(f, MemoizedFunction)}
+
+    def cache_clear(self) -> None:
+        """Очистка кэшей всех функций"""
+        for function in self.functions.values():
+            if isinstance(function, MemoizedFunction):
+                function.cache_clear()
+
+    @classmethod
+    def mix(cls, substances: Sequence["Substance"], weights: Sequence[float] = None, name: str = "mix") -> "Substance":
+        """
+        Смешение потоков веществ.
+
+        Args:
+            substances: Смешиваемые вещества
+            weights: Массовые расходы потоков, None - параметр "m" каждого вещества
+            name: Название смеси
+
+        Returns:
+            Вещество с массово-средними составом и параметрами, "m" - сумма весов.
+            Функции сохраняются, если они одинаковы у всех веществ.
+        """
+        if weights is None:
+            weights = [s.parameters[mixing.MASS_FLOW] for s in substances]
+        return cls.mix_many(substances, [weights], [name])[0]
+
+    @classmethod
+    def mix_many(
+        cls, substances: Sequence["Substance"], weights: Sequence[Sequence[float]], names: Sequence[str] = None
+    ) -> List["Substance"]:
+        """
+        Пакетное смешение: N узлов из одних и тех же S потоков за одно матричное произведение.
+
+        Args:
+            substances: Потоки (S)
+            weights: Массовые расходы потоков в узлы (N, S)
+            names: Названия смесей (N), None - "mix"
+        """
+        weights = np.asarray(weights, dtype="float64")
+        if weights.ndim != 2 or weights.shape[1] != len(substances):
+            raise ValueError(f"{weights.shape=} must be (N, {len(substances)})")
+        names = ["mix"] * len(weights) if names is None else names
+        if len(names) != len(weights):
+            raise ValueError(f"{len(names)=} must be {len(weights)=}")
+
+        species = mixing.keys(s.composition for s in substances)
+        parameters = mixing.keys(s.parameters for s in substances)
+        fractions, means = mixing.mix(
+            mixing.matrix([s.composition for s in substances], species),
+            mixing.matrix([s.parameters for s in substances], parameters, fill=nan),
+            weights,
+        )
+        if mixing.MASS_FLOW in parameters:
+            means[:, parameters.index(mixing.MASS_FLOW)] = weights.sum(axis=1)
+
+        functions = mixing.common([s.functions for s in substances])
+
+        mixtures = []
+        for name, row, values in zip(names, fractions.tolist(), means.tolist()):
+            if not isinstance(name, str):
+                raise TypeError(f"{name} must be a str")
+            mixtures.append(  # состав и параметры уже нормализованы и числовые
+                cls.trusted(
+                    name,
+                    {k: v for k, v in zip(species, row) if v > 0},
+                    {k: v for k, v in zip(parameters, values) if v == v},
+                    dict(functions),
+                )
+            )
+        return mixtures
+
     @property
     def humidity(self) -> float:
         """Влажность"""
@@ -150,6 +402,99 @@ class Substance:
             return nan
         return h2o / total
 
+    @property
+    def molar_mass(self) -> float:
+        """Молярная масса смеси по таблице компонентов, кг/моль"""
+        return float(mixture(self.composition).molar_mass[0])
+
+    @property
+    def gas_constant(self) -> float:
+        """Газовая постоянная смеси, Дж/(кг*К)"""
+        return float(mixture(self.composition).gas_constant[0])
+
+    @property
+    def mole_fractions(self) -> Dict[str, float]:
+        """Мольные доли компонентов"""
+        properties = mixture(self.composition)
+        fractions = dict(zip(properties.species, properties.mole_fractions[0].tolist()))
+        return {k: fractions[k] for k in self.composition}
+
+    def heat_capacity(self, temperature: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """Изобарная теплоемкость смеси по полиномам NASA, Дж/(кг*К); вне их диапазона - NaN"""
+        result = mixture(self.composition).heat_capacity(np.asarray(temperature, dtype="float64")[..., None])
+        result = result[..., 0]
+        return float(result) if result.ndim == 0 else result
+
+
+class FrozenSubstance(Substance):
+    """Неизменяемое вещество: проверяется один раз, хэшируется, безопасно разделяется между потоками"""
+
+    __slots__ = ("_hash",)
+
+    def __init__(
+        self,
+        name: str,
+        composition: Dict[str, float] = None,
+        parameters: Dict[str, Union[int, float]] = None,
+        functions: Dict[str, Callable] = None,
+    ) -> None:
+        substance = Substance(name, composition, parameters, functions)  # валидация
+        self.__freeze(substance.name, substance.composition, substance.parameters, substance.functions)
+
+    @classmethod
+    def trusted(
+        cls,
+        name: str,
+        composition: Dict[str, float],
+        parameters: Dict[str, Union[int, float]],
+        functions: Dict[str, Callable],
+    ) -> "FrozenSubstance":
+        """Создание из уже проверенных данных без валидации. Словари не должны изменяться после вызова"""
+        substance = cls.__new__(cls)
+        substance.__freeze(name, composition, parameters, functions)
+        return substance
+
+    def __freeze(self, name, composition, parameters, functions) -> None:
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "composition", self._share(composition))
+        object.__setattr__(self, "parameters", self._share(parameters))
+        object.__setattr__(self, "functions", self._share(functions))
+        key = (name, frozenset(composition.items()), frozenset(parameters.items()), frozenset(functions.items()))
+        object.__setattr__(self, "_hash", hash(key))
+
+    def __setattr__(self, key: str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _share(self, mapping: Dict) -> MappingProxyType:
+        """Неизменяемые словари разделяются между веществами без копирования"""
+        return mapping if isinstance(mapping, MappingProxyType) else MappingProxyType(mapping)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FrozenSubstance):
+            return NotImplemented
+        return self._hash == other._hash and (
+            self.name == other.name
+            and self.composition == other.composition
+            and self.parameters == other.parameters
+            and self.functions == other.functions
+        )
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def freeze(self) -> "FrozenSubstance":
+        return self
+
+    def thaw(self) -> Substance:
+        """Изменяемая копия вещества"""
+        return Substance.trusted(self.name, dict(self.composition), dict(self.parameters), dict(self.functions))
+
 
 if __name__ == "__main__":
     air = Substance(
@@ -1,11 +1,16 @@
 from copy import deepcopy
+from math import exp
 
+import numpy as np
 import pytest
 
 try:
-    from .substance import Substance
+    from . import mixing
+    from .function import depends
+    from .substance import FrozenSubstance, Substance
 except ImportError:
-    from substance import Substance
+    from substance import FrozenSubstance, Substance, mixing
+    from substance.function import depends
 
 
 @pytest.fixture
@@ -150,6 +155,245 @@ class TestSubstance:
         # Проверка, что функции работают корректно
         assert s1.functions["Cp"](T=1) == s2.functions["Cp"](T=1)
 
+    def test_normalize_copy(self):
+        """Валидация не изменяет словарь вызывающего"""
+        composition = {"H": 0.5, "O": 0.25}
+        s = Substance("Water", composition)
+        assert composition == {"H": 0.5, "O": 0.25}
+        assert s.composition == pytest.approx({"H": 2 / 3, "O": 1 / 3})
+
+    def test_trusted(self, water):
+        """Тест создания без валидации"""
+        composition, parameters, functions = {"H2O": 1.0}, {"m": 2}, {"f": abs}
+        s = Substance.trusted("Water", composition, parameters, functions)
+        assert type(s) is Substance
+        assert s.composition is composition and s.parameters is parameters and s.functions is functions
+        with pytest.raises(TypeError):
+            s.parameters = {"m": "two"}  # дальнейшие присвоения проверяются
+
+    def test_frozen(self, water):
+        """Тест неизменяемого вещества"""
+        frozen = water.freeze()
+        assert isinstance(frozen, FrozenSubstance)
+        assert frozen.composition == water.composition and frozen.parameters == water.parameters
+        with pytest.raises(AttributeError):
+            frozen.name = "Ice"
+        with pytest.raises(TypeError):
+            frozen.parameters["m"] = 1
+        with pytest.raises(Exception):
+            del frozen.name
+        with pytest.raises(AttributeError):
+            frozen.memoize()
+
+        assert deepcopy(frozen) is frozen
+        assert frozen == water.freeze() and hash(frozen) == hash(water.freeze())
+        assert len({frozen, water.freeze(), FrozenSubstance("Ice", {"H2O": 1})}) == 2
+        assert frozen.functions["heat_capacity"](T=10) == 4187
+
+        thawed = frozen.thaw()
+        thawed.parameters["m"] = 1
+        assert type(thawed) is Substance and frozen.parameters["m"] == 10
+
+        with pytest.raises(ValueError):
+            FrozenSubstance("Water", {"H": -1})
+        assert isinstance(FrozenSubstance.mix([frozen, frozen]), FrozenSubstance)
+
+    @pytest.mark.benchmark
+    def test_substance_trusted(self, benchmark):
+        composition, parameters, functions = {"H": 2 / 3, "O": 1 / 3}, {"m": 1}, {"Cp": abs}
+        benchmark(Substance.trusted, "bench", composition, parameters, functions)
+
+    @pytest.mark.benchmark
+    def test_frozen_substance_hash(self, benchmark, water):
+        frozen = water.freeze()
+        benchmark(hash, frozen)
+
+    def test_evolve(self, water):
+        """Тест обновления состояния"""
+        s = water.evolve(parameters={"TT": 300.0, "m": 5})
+        assert s.parameters == {"density": 1000, "m": 5, "TT": 300.0}
+        assert water.parameters == {"density": 1000, "m": 10}
+        assert s.composition == water.composition and s.composition is not water.composition
+        assert s.functions == water.functions and s.name == water.name
+
+        s.composition["H"] = 1
+        assert water.composition["H"] == 2 / 3
+
+        s = water.evolve(name="Steam", composition={"H2O": 1})
+        assert s.name == "Steam" and s.composition == {"H2O": 1}
+        with pytest.raises(TypeError):
+            water.evolve(parameters={"TT": "hot"})
+        with pytest.raises(ValueError):
+            water.evolve(composition={"H2O": 2})
+
+        frozen = water.freeze()
+        evolved = frozen.evolve(parameters={"TT": 300.0})
+        assert isinstance(evolved, FrozenSubstance)
+        assert evolved.parameters["TT"] == 300.0 and "TT" not in frozen.parameters
+        assert evolved.composition is frozen.composition and evolved.functions is frozen.functions
+
+    @pytest.mark.benchmark
+    def test_substance_evolve(self, benchmark, water):
+        """Бенчмарк обновления двух параметров"""
+        benchmark(water.evolve, parameters={"TT": 300.0, "PP": 101325.0})
+
+    @pytest.mark.benchmark
+    def test_frozen_substance_evolve(self, benchmark, water):
+        """Бенчмарк обновления двух параметров неизменяемого вещества"""
+        benchmark(water.freeze().evolve, parameters={"TT": 300.0, "PP": 101325.0})
+
+    def test_eq(self):
+        """Тест сравнения с относительной погрешностью"""
+        a = Substance("a", {"N2": 0.5, "O2": 0.5}, {"TT": 300.0, "PP": -1e5})
+        assert a.eq(a.evolve(parameters={"TT": 300.2}), 1e-3)
+        assert a.evolve(parameters={"TT": 300.2}).eq(a, 1e-3)
+        assert a.eq(a.evolve(parameters={"PP": -1.0005e5}), 1e-3)
+        assert not a.eq(a.evolve(parameters={"PP": 1e5}), 1e-3)
+        assert not a.eq(a.evolve(parameters={"TT": 301.0}), 1e-3)
+        assert not a.eq(a.evolve(parameters={"m": 1}), 1e-3)
+        assert a.eq(a.evolve(composition={"N2": 0.4, "O2": 0.6}), 1e-3)
+        assert not a.eq(a.evolve(composition={"N2": 0.4, "O2": 0.6}), 1e-3, composition=True)
+
+    def test_refresh(self):
+        """Тест пересчета только зависимых производных свойств"""
+        calls = []
+
+        def hcp(TT):
+            calls.append("hcp")
+            return 1000 + 0.1 * TT
+
+        @depends(temperature="TT", pressure="PP")
+        def density(temperature, pressure):
+            calls.append("density")
+            return pressure / (287 * temperature)
+
+        def sound(k):  # нет параметра k - не вычисляется
+            return k
+
+        s = Substance("air", {"N2": 1}, {"TT": 300.0, "PP": 101325.0}, {"hcp": hcp, "density": density, "sound": sound})
+        assert s.refresh() == {"hcp": 1030, "density": 101325 / (287 * 300)}
+        assert calls == ["hcp", "density"]
+        assert s.dependents("TT") == ["hcp", "density"] and s.dependents("PP") == ["density"]
+
+        calls.clear()
+        s.refresh()
+        assert calls == []
+
+        s.parameters["PP"] = 2e5
+        assert s.refresh()["density"] == 2e5 / (287 * 300)
+        assert calls == ["density"]
+
+        calls.clear()
+        evolved = s.evolve(parameters={"TT": 400.0})
+        assert evolved.refresh(["hcp"]) == {"hcp": 1040}
+        deepcopy(s).refresh()
+        assert calls == ["hcp"]
+
+        s.functions = {**s.functions, "hcp": lambda TT: 0}  # замена функции
+        assert s.refresh()["hcp"] == 0
+
+    @pytest.mark.parametrize("changed", [False, True])
+    @pytest.mark.benchmark
+    def test_substance_refresh(self, benchmark, changed):
+        functions = {f"f{i}": (lambda TT: TT * 2) if i % 2 else (lambda PP: PP * 2) for i in range(20)}
+        s = Substance("bench", {"N2": 1}, {"TT": 300.0, "PP": 1e5}, functions)
+        s.refresh()
+
+        def benchfunc():
+            if changed:
+                s.parameters["TT"] += 1
+            return s.refresh()
+
+        benchmark(benchfunc)
+
+    def test_evaluate(self, water):
+        """Тест векторизованного вычисления функций"""
+        T = np.linspace(0, 100, 11)
+        assert np.array_equal(water.evaluate("heat_capacity", T=T), 4186 + 0.1 * T)
+        assert water.evaluate("heat_capacity", T=50).shape == ()
+
+        s = Substance(
+            "air",
+            functions={
+                "gc": lambda T: 287.3,  # константа
+                "k": lambda T: 1.4 if T < 500 else 1.3,  # не принимает массивы
+                "hcp": lambda T, P: 1000 * exp(T / 1000) + P,  # math
+            },
+        )
+        assert np.array_equal(s.evaluate("gc", T=T), np.full_like(T, 287.3))
+        T = np.linspace(300, 800, 11)
+        expected = [1.4 if t < 500 else 1.3 for t in T]
+        assert np.array_equal(s.evaluate("k", T=T), expected)
+        assert np.array_equal(s.evaluate("k", T=T, vectorized=False, chunk_size=3), expected)
+        with pytest.raises(ValueError):
+            s.evaluate("k", T=T, vectorized=True)
+
+        hcp = s.evaluate("hcp", T=T[:, None], P=[0, 1e5])  # broadcasting
+        assert hcp.shape == (11, 2)
+        assert hcp[3, 1] == pytest.approx(1000 * exp(T[3] / 1000) + 1e5)
+
+        with pytest.raises(KeyError):
+            s.evaluate("cp", T=T)
+
+    @pytest.mark.parametrize("vectorized", [True, False])
+    @pytest.mark.benchmark
+    def test_substance_evaluate(self, benchmark, water, vectorized):
+        T = np.linspace(0, 100, 100_000)
+        benchmark(water.evaluate, "heat_capacity", vectorized=vectorized, T=T)
+
+    def test_mix(self):
+        """Тест смешения потоков"""
+        cp = lambda T: 1000 + T  # noqa: E731
+        air = Substance("air", {"N2": 0.77, "O2": 0.23}, {"m": 3.0, "TT": 300.0}, {"Cp": cp, "k": lambda T: 1.4})
+        steam = Substance("steam", {"H2O": 1}, {"m": 1.0, "TT": 500.0, "PP": 1e5}, {"Cp": cp})
+
+        mixture = Substance.mix([air, steam], name="wet air")
+        assert mixture.name == "wet air"
+        assert mixture.composition == pytest.approx({"N2": 0.5775, "O2": 0.1725, "H2O": 0.25})
+        assert mixture.humidity == pytest.approx(0.25)
+        assert mixture.parameters == pytest.approx({"m": 4.0, "TT": 350.0, "PP": 1e5})
+        assert mixture.functions == {"Cp": cp}  # только общие функции
+
+        weighted = Substance.mix([air, steam], weights=[1, 1])
+        assert weighted.parameters["m"] == 2 and weighted.parameters["TT"] == 400
+
+        nodes = Substance.mix_many([air, steam], [[1, 0], [0, 2], [3, 1]], names=["a", "b", "c"])
+        assert [n.name for n in nodes] == ["a", "b", "c"]
+        assert nodes[0].composition == pytest.approx(air.composition)
+        assert nodes[1].composition == {"H2O": 1} and nodes[1].parameters["m"] == 2
+        assert nodes[2].composition == pytest.approx(mixture.composition)
+
+        with pytest.raises(ValueError):
+            Substance.mix_many([air, steam], [1, 1])
+        with pytest.raises(ValueError):
+            Substance.mix_many([air, steam], [[1, 0], [0, 2]], names=["a"])
+        with pytest.raises(ValueError):
+            Substance.mix([air, steam], weights=[-1, 1])
+
+    def test_mixing_arrays(self):
+        """Тест векторизованного смешения на матрицах"""
+        substances = [{"A": 1.0}, {"B": 0.5, "C": 0.5}]
+        species = mixing.keys(substances)
+        assert species == ("A", "B", "C")
+        compositions = mixing.matrix(substances, species)
+        parameters = np.array([[300.0, np.nan], [500.0, 2.0]])
+
+        fractions, means = mixing.mix(compositions, parameters, np.array([[1, 1], [0, 0]]))
+        assert fractions[0] == pytest.approx([0.5, 0.25, 0.25])
+        assert np.all(fractions[1] == 0) and np.all(np.isnan(means[1]))
+        assert means[0] == pytest.approx([400, 2])
+
+    @pytest.mark.benchmark
+    def test_substance_mix_many(self, benchmark):
+        """Бенчмарк 1000 узлов из 50 потоков"""
+        rng = np.random.default_rng(0)
+        streams = [
+            Substance(f"s{i}", {f"X{j}": rng.uniform(0.1, 1) for j in rng.choice(20, 5, replace=False)}, {"m": 1.0})
+            for i in range(50)
+        ]
+        weights = rng.uniform(0, 1, (1000, 50))
+        benchmark(Substance.mix_many, streams, weights)
+
 
 if __name__ == "__main__":
     pytest.main(
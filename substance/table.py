@@ -0,0 +1,150 @@
+from typing import Callable, Dict, Iterator, List, Sequence, Union
+
+import numpy as np
+
+from . import mixing
+from .species import Mixtures
+from .substance import Substance
+
+
+class SubstanceTable:
+    """
+    Таблица веществ по столбцам.
+
+    Состав - матрица массовых долей (n, len(species)), каждый параметр - столбец float64
+    (NaN - не задан), функции - одно общее отображение для всех строк.
+    """
+
+    __slots__ = ("names", "species", "composition", "parameters", "functions")
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        species: Sequence[str],
+        composition: np.ndarray,
+        parameters: Dict[str, np.ndarray] = None,
+        functions: Dict[str, Callable] = None,
+    ) -> None:
+        """
+        Args:
+            names: Названия веществ (n)
+            species: Компоненты (K)
+            composition: Массовые доли (n, K), 0 - компонента нет; строки нормализуются
+            parameters: Параметры: название - столбец (n)
+            functions: Общие функции: название - функция
+        """
+        names = list(names)
+        if not all(isinstance(name, str) for name in names):
+            raise TypeError("names must be str")
+        species = tuple(species)
+        composition = np.array(composition, dtype="float64").reshape(len(names), len(species))
+        if np.any(composition < 0) or np.any(np.isnan(composition)):
+            raise ValueError("composition values must be >= 0")
+
+        self.names = names
+        self.species = species
+        self.composition = composition
+        self.parameters = {}
+        for name, values in (parameters or {}).items():
+            self.set_parameter(name, values)
+        self.functions = dict(Substance("", functions=functions or {}).functions)  # валидация
+        self.normalize()
+
+    @classmethod
+    def from_substances(cls, substances: Sequence[Substance]) -> "SubstanceTable":
+        """Таблица из веществ; функции - общие для всех веществ"""
+        species = mixing.keys(s.composition for s in substances)
+        parameters = mixing.keys(s.parameters for s in substances)
+        values = mixing.matrix([s.parameters for s in substances], parameters, fill=np.nan)
+        return cls(
+            [s.name for s in substances],
+            species,
+            mixing.matrix([s.composition for s in substances], species),
+            dict(zip(parameters, values.T)),
+            mixing.common([s.functions for s in substances]),
+        )
+
+    def to_substances(self) -> List[Substance]:
+        return [self[i] for i in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(n={len(self)}, species={len(self.species)}, parameters={list(self.parameters)})"
+
+    def __getitem__(self, key) -> Union[Substance, "SubstanceTable"]:
+        """Целое - вещество, срез, маска или индексы - таблица"""
+        if isinstance(key, (int, np.integer)):
+            i = range(len(self))[key]
+            row = self.composition[i].tolist()
+            return Substance.trusted(  # столбцы таблицы уже проверены
+                self.names[i],
+                {k: v for k, v in zip(self.species, row) if v > 0},
+                {k: v for k, v in zip(self.parameters, self.values(i)) if v == v},
+                dict(self.functions),
+            )
+        table = object.__new__(SubstanceTable)
+        table.names = np.array(self.names, dtype=object)[key].tolist()
+        table.species = self.species
+        table.composition = self.composition[key]
+        table.parameters = {k: v[key] for k, v in self.parameters.items()}
+        table.functions = self.functions
+        return table
+
+    def __iter__(self) -> Iterator[Substance]:
+        return (self[i] for i in range(len(self)))
+
+    def values(self, i: int) -> List[float]:
+        """Значения параметров строки i"""
+        return [float(column[i]) for column in self.parameters.values()]
+
+    def set_parameter(self, name: str, values: Union[float, np.ndarray]) -> None:
+        """Присвоение столбца параметра (скаляр или массив (n), NaN - не задан)"""
+        if not isinstance(name, str):
+            raise TypeError(f"{name} must be a str")
+        try:
+            column = np.array(np.broadcast_to(np.asarray(values, dtype="float64"), (len(self),)))
+        except (TypeError, ValueError) as exception:
+            raise TypeError(f"Parameter {name} must be numeric of shape ({len(self)},)") from exception
+        self.parameters[name] = column
+
+    def normalize(self) -> None:
+        """Нормализация химического состава всех строк"""
+        total = self.composition.sum(axis=1, keepdims=True)
+        np.divide(self.composition, total, out=self.composition, where=total > 0)
+
+    @property
+    def humidity(self) -> np.ndarray:
+        """Влажность каждой строки"""
+        if "H2O" not in self.species:
+            return np.where(self.composition.sum(axis=1) > 0, 0.0, np.nan)
+        total = self.composition.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total > 0, self.composition[:, self.species.index("H2O")] / total, np.nan)
+
+    def mixtures(self) -> Mixtures:
+        """Свойства всех строк по таблице компонентов: молярная масса, газовая постоянная, cp(T)"""
+        return Mixtures(self.species, self.composition)
+
+    def mix(self, weights: np.ndarray, names: Sequence[str] = None) -> "SubstanceTable":
+        """
+        Смешение строк таблицы в N узлов.
+
+        Args:
+            weights: Массовые расходы строк в узлы (N, n)
+            names: Названия смесей (N), None - "mix"
+        """
+        weights = np.asarray(weights, dtype="float64")
+        if weights.ndim != 2 or weights.shape[1] != len(self):
+            raise ValueError(f"{weights.shape=} must be (N, {len(self)})")
+        names = ["mix"] * len(weights) if names is None else names
+        if len(names) != len(weights):
+            raise ValueError(f"{len(names)=} must be {len(weights)=}")
+        parameters = list(self.parameters)
+        values = np.stack([self.parameters[k] for k in parameters], axis=1) if parameters else np.empty((len(self), 0))
+        fractions, means = mixing.mix(self.composition, values, weights)
+        columns = dict(zip(parameters, means.T))
+        if mixing.MASS_FLOW in columns:
+            columns[mixing.MASS_FLOW] = weights.sum(axis=1)
+        return SubstanceTable(names, self.species, fractions, columns, self.functions)
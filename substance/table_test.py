@@ -0,0 +1,128 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+try:
+    from .substance import Substance
+    from .table import SubstanceTable
+except ImportError:
+    from substance import Substance, SubstanceTable
+
+
+def heat_capacity(T):
+    return 1000 + 0.1 * T
+
+
+@pytest.fixture
+def substances():
+    return [
+        Substance("air", {"N2": 0.77, "O2": 0.23}, {"m": 3.0, "TT": 300.0}, {"Cp": heat_capacity}),
+        Substance("steam", {"H2O": 1}, {"m": 1.0, "TT": 500.0, "PP": 1e5}, {"Cp": heat_capacity}),
+    ]
+
+
+def population(n: int):
+    return [
+        Substance(
+            f"s{i}",
+            {"N2": 0.7, "O2": 0.2, **({"H2O": 0.1 * (i % 3)} if i % 3 else {})},
+            {"m": 1.0 + i, "TT": 300.0 + i},
+        )
+        for i in range(n)
+    ]
+
+
+class TestSubstanceTable:
+    """Тесты для класса SubstanceTable"""
+
+    def test_roundtrip(self, substances):
+        table = SubstanceTable.from_substances(substances)
+        assert len(table) == 2
+        assert table.species == ("N2", "O2", "H2O")
+        assert np.isnan(table.parameters["PP"][0])
+        assert table.functions == {"Cp": heat_capacity}
+        for original, restored in zip(substances, table.to_substances()):
+            assert restored.name == original.name
+            assert restored.composition == pytest.approx(original.composition)
+            assert restored.parameters == original.parameters
+            assert restored.functions == original.functions
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            SubstanceTable(["a"], ["N2"], [[-1.0]])
+        with pytest.raises(TypeError):
+            SubstanceTable([1], ["N2"], [[1.0]])
+        with pytest.raises(TypeError):
+            SubstanceTable(["a"], ["N2"], [[1.0]], functions={"f": 1})
+        table = SubstanceTable(["a", "b"], ["N2", "O2"], [[1, 1], [0, 0]])
+        assert table.composition.tolist() == [[0.5, 0.5], [0, 0]]
+        with pytest.raises(TypeError):
+            table.set_parameter("TT", [1, 2, 3])
+
+    def test_vectorized(self, substances):
+        table = SubstanceTable.from_substances(population(30))
+        expected = [s.humidity for s in table]
+        assert table.humidity == pytest.approx(expected)
+        assert np.allclose(table.composition.sum(axis=1), 1)
+
+        table.set_parameter("PP", 101325)
+        assert table[5].parameters["PP"] == 101325
+        table.parameters["TT"] += 10
+        assert table[0].parameters["TT"] == 310
+
+        subset = table[table.humidity > 0]
+        assert len(subset) == 20
+        assert subset.functions is table.functions
+
+    def test_mix(self, substances):
+        table = SubstanceTable.from_substances(substances)
+        mixed = table.mix([[3, 1], [0, 2]], names=["a", "b"])
+        expected = Substance.mix(substances, [3, 1])
+        assert mixed[0].composition == pytest.approx(expected.composition)
+        assert mixed[0].parameters == pytest.approx(expected.parameters)
+        assert mixed[1].parameters["m"] == 2
+        with pytest.raises(ValueError):
+            table.mix([1, 1])
+        with pytest.raises(ValueError):
+            table.mix([[3, 1], [0, 2]], names=["a", "b", "c"])
+
+    def test_memory(self):
+        """Строка таблицы занимает на порядок меньше памяти, чем Substance"""
+        n = 2_000
+        tracemalloc.start()
+        substances = population(n)
+        objects, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        table = SubstanceTable.from_substances(substances)
+        columns, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert len(table) == n
+        assert columns * 5 < objects
+
+    @pytest.mark.benchmark
+    def test_table_from_substances(self, benchmark):
+        substances = population(1_000)
+        benchmark(SubstanceTable.from_substances, substances)
+
+    @pytest.mark.benchmark
+    def test_table_humidity(self, benchmark):
+        table = SubstanceTable.from_substances(population(10_000))
+        benchmark(lambda: table.humidity)
+
+
+if __name__ == "__main__":
+    pytest.main(
+        [
+            __file__,
+            "-v",
+            "-s",
+            "-x",
+            "--benchmark-columns=mean,min,max,stddev,median,rounds,outliers",
+            "--benchmark-sort=name",
+            "--benchmark-min-rounds=10",
+        ]
+    )